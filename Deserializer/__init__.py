@@ -0,0 +1,4 @@
+from .deserializer import Deserializer, NosjError
+from .loader import load, loads
+
+__all__ = ["Deserializer", "NosjError", "load", "loads"]
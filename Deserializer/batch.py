@@ -0,0 +1,62 @@
+"""
+Reentrant, thread-safe deserialization of many documents.
+
+main() relies on the process-global redirect_stdout and process_map prints
+and calls sys.exit on error, so neither can run on several threads at once.
+deserialize() renders into a per-call list and returns the outcome instead,
+touching no shared mutable state; deserialize_many() fans documents out to a
+thread pool. On free-threaded (no-GIL) CPython 3.13+ builds the work scales
+across cores; on standard builds it is still correct.
+
+    results = deserialize_many(documents, workers=8)
+    for r in results:
+        if r.exit_code == 0:
+            use(r.output)          # exact stdout main.py would print
+        else:
+            log(r.error)           # message main.py prints after 'ERROR -- '
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, NamedTuple, Optional
+
+from .deserializer import Deserializer
+from .limits import Limits
+from .parser import NosjParser
+
+
+class Result(NamedTuple):
+    output: Optional[str]   # stdout of a successful run, else None
+    error: Optional[str]    # error message of a failed run, else None
+    exit_code: int          # 0 on success, 66 on error
+
+
+def deserialize(src, limits: Optional[Limits] = None) -> Result:
+    """Deserialize one document (str, or bytes as UTF-8) like main.py does."""
+    budget = limits.start() if limits is not None else None
+    try:
+        if isinstance(src, (bytes, bytearray)):
+            if budget is not None:
+                budget.check_input(len(src))
+            src = bytes(src).decode("utf-8")
+        data = NosjParser(src, budget).parse()
+        lines = Deserializer.render_map(data, budget.renew() if budget is not None else None)
+    except Exception as e:
+        return Result(None, str(e), 66)
+    lines.append("end-map\n")
+    return Result("begin-map\n" + "\n".join(lines), None, 0)
+
+
+def deserialize_many(inputs: Iterable, workers: Optional[int] = None,
+                     limits: Optional[Limits] = None) -> List[Result]:
+    """
+    Deserialize every document in `inputs` on a pool of `workers` threads
+    (default: CPU count). Results come back in input order, one per document;
+    a bad document only affects its own Result.
+    """
+    docs = list(inputs)
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers == 1 or len(docs) <= 1:
+        return [deserialize(doc, limits) for doc in docs]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda doc: deserialize(doc, limits), docs))
@@ -2,6 +2,39 @@ import sys
 import re
 import urllib.parse
 
+try:
+    from .limits import LimitExceeded
+    from .tokens import ComplexStrToken, NumToken, SimpleStrToken
+except ImportError:
+    from limits import LimitExceeded  # type: ignore
+    from tokens import ComplexStrToken, NumToken, SimpleStrToken  # type: ignore
+
+# Compiled once; these used to be rebuilt / looked up on every value.
+KEY_PATTERN = re.compile(r"^[a-z]+$")
+NUM_PATTERN = re.compile(r"^[01]+$")
+SIMPLE_STRING_PATTERN = re.compile(r"^[a-zA-Z0-9 \t]+s$")
+COMPLEX_STRING_PATTERN = re.compile(r'^(?:%[0-9A-Fa-f]{2}|.)*$')
+PERCENT_SEQUENCE_PATTERN = re.compile(r"%[0-9A-Fa-f]{2}")
+
+
+class NosjError(ValueError):
+    """
+    Structured deserialization error raised by the library API (loader.py)
+    instead of printing and exiting.
+
+      message   same text the CLI prints after 'ERROR -- '
+      kind      'parse', 'key', 'value' or 'limit'
+      path      keys leading to the offending entry (empty for parse errors)
+      position  character offset in the source (parse errors only)
+    """
+
+    def __init__(self, message: str, kind: str = "value", path: tuple = (), position=None):
+        super().__init__(message)
+        self.message = message
+        self.kind = kind
+        self.path = path
+        self.position = position
+
 
 class Deserializer:
     """
@@ -37,7 +70,7 @@ class Deserializer:
 
     @staticmethod
     def process_num(key: str, val: str) -> str:
-        if re.match(r"^[01]+$", val) is None:
+        if NUM_PATTERN.match(val) is None:
             raise ValueError("Input string must be a binary string")
         return f"{key} -- num -- {Deserializer.decode_num(val)}"
 
@@ -46,7 +79,6 @@ class Deserializer:
     # ---------------------------
     @staticmethod
     def decode_simple_str(bstr: str) -> str:
-        SIMPLE_STRING_PATTERN = re.compile(r"^[a-zA-Z0-9 \t]+s$")
         raw = bstr
         if not SIMPLE_STRING_PATTERN.match(raw):
             raise ValueError(f"Invalid simple string: {raw}")
@@ -64,14 +96,12 @@ class Deserializer:
     # ---------------------------
     @staticmethod
     def decode_complex_str(bstr: str) -> str:
-        COMPLEX_STRING_PATTERN = re.compile(r'^(?:%[0-9A-Fa-f]{2}|.)*$')
-
         # Step 1: Validate structure
         if not COMPLEX_STRING_PATTERN.match(bstr):
             raise ValueError(f"Invalid complex string format: {bstr}")
 
         # Step 2: Ensure at least one percent-encoded sequence
-        if not re.search(r"%[0-9A-Fa-f]{2}", bstr):
+        if not PERCENT_SEQUENCE_PATTERN.search(bstr):
             raise ValueError(
                 f"Complex string must contain at least one %XY sequence: {bstr}"
             )
@@ -87,37 +117,128 @@ class Deserializer:
         return f"{key} -- string -- "
 
     # ---------------------------
-    # Maps
+    # Rendering (no printing)
     # ---------------------------
     @staticmethod
-    def process_map(map_data: dict) -> None:
+    def decode_value(val: str) -> tuple:
         """
-        Process a nested nosj map and print lines to stdout.
-        Any exception is converted into the required stderr + exit(66).
+        Classify and decode a leaf value to ("num", int) or ("string", str).
+        Raises ValueError on invalid values (same messages as process_map).
+
+        Typed tokens from NosjParser are already classified and validated by
+        the scanner, so they are decoded directly; plain strs are classified here.
         """
+        kind = type(val)
+        if kind is NumToken:
+            return "num", Deserializer.decode_num(val)
+        if kind is SimpleStrToken:
+            return "string", val[:-1]
+        if kind is ComplexStrToken:
+            return "string", Deserializer.decode_complex_str(val) if val else ""
+
+        if NUM_PATTERN.match(val):
+            return "num", Deserializer.decode_num(val)
+        elif SIMPLE_STRING_PATTERN.match(val):
+            return "string", Deserializer.decode_simple_str(val)
+        else:
+            return "string", Deserializer.decode_complex_str(val) if val else ""
+
+    @staticmethod
+    def render_value(key: str, val: str) -> str:
+        """Render a leaf value as its single output line."""
+        kind, decoded = Deserializer.decode_value(val)
+        return f"{key} -- {kind} -- {decoded}"
+
+    @staticmethod
+    def render_map(map_data: dict, budget=None) -> list:
+        """
+        Render a nested nosj map into its output lines (without begin/end-map
+        wrapper of the top level). Raises on the first invalid key or value.
+        An optional Budget (see limits.py) is enforced while walking the map.
+        """
+        lines = []
+        Deserializer._render_into(map_data, lines, budget, 1)
+        return lines
+
+    @staticmethod
+    def _render_into(map_data: dict, lines: list, budget=None, depth: int = 1) -> None:
+        if budget is not None:
+            budget.check_depth(depth)
+        for key, val in map_data.items():
+            if not KEY_PATTERN.match(key):
+                raise ValueError(f"Invalid key format: {key}")
+            if budget is not None:
+                budget.count_entry()
+
+            if isinstance(val, str):
+                if budget is not None:
+                    budget.check_value(val)
+                lines.append(Deserializer.render_value(key, val))
+
+            elif isinstance(val, dict):
+                # Map header for this key
+                lines.append(f"{key} -- map -- ")
+                lines.append("begin-map")
+                Deserializer._render_into(val, lines, budget, depth + 1)   # recurse
+                lines.append("end-map")
+
+            else:
+                # Unknown type in the input structure
+                raise ValueError(f"Unsupported value type for key '{key}': {type(val).__name__}")
+
+    # ---------------------------
+    # Native values (no text)
+    # ---------------------------
+    @staticmethod
+    def decode_map(map_data: dict, budget=None) -> dict:
+        """
+        Decode a nested nosj map into native values: num -> int,
+        string -> str, map -> dict (key order preserved). Raises NosjError
+        with the key path of the first invalid entry.
+        """
+        return Deserializer._decode_into(map_data, budget, 1, ())
+
+    @staticmethod
+    def _decode_into(map_data: dict, budget, depth: int, path: tuple) -> dict:
+        result = {}
+        key = None
         try:
+            if budget is not None:
+                budget.check_depth(depth)
             for key, val in map_data.items():
-                if not re.match(r"^[a-z]+$", key):
-                    raise ValueError(f"Invalid key format: {key}")
+                if not KEY_PATTERN.match(key):
+                    raise NosjError(f"Invalid key format: {key}", "key", path + (key,))
+                if budget is not None:
+                    budget.count_entry()
 
                 if isinstance(val, str):
-                    if re.match(r"^[01]+$", val):
-                        print(Deserializer.process_num(key, val))
-                    elif re.match(r"^[a-zA-Z0-9 \t]+s$", val):
-                        print(Deserializer.process_simple_str(key, val))
-                    else:
-                        print(Deserializer.process_complex_str(key, val))
-
+                    if budget is not None:
+                        budget.check_value(val)
+                    result[key] = Deserializer.decode_value(val)[1]
                 elif isinstance(val, dict):
-                    # Map header for this key
-                    print(f"{key} -- map -- ")
-                    print("begin-map")
-                    Deserializer.process_map(val)   # recurse
-                    print("end-map")
-
+                    result[key] = Deserializer._decode_into(val, budget, depth + 1, path + (key,))
                 else:
-                    # Unknown type in the input structure
                     raise ValueError(f"Unsupported value type for key '{key}': {type(val).__name__}")
+        except NosjError:
+            raise
+        except Exception as e:
+            kind = "limit" if isinstance(e, LimitExceeded) else "value"
+            where = path if key is None else path + (key,)
+            raise NosjError(str(e), kind, where) from e
+        return result
+
+    # ---------------------------
+    # Maps
+    # ---------------------------
+    @staticmethod
+    def process_map(map_data: dict, budget=None) -> None:
+        """
+        Process a nested nosj map and print lines to stdout.
+        Any exception is converted into the required stderr + exit(66).
+        """
+        try:
+            for line in Deserializer.render_map(map_data, budget):
+                print(line)
 
         except Exception as e:
             # Convert *any* error into the professor-mandated format
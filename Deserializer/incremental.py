@@ -0,0 +1,289 @@
+"""
+Incremental re-parse of edited NOSJ documents.
+
+IncrementalDocument keeps the source-span tree of the previous parse (start /
+end offsets of every map and value) together with the rendered output of each
+map. When the text changes, only the innermost map(s) enclosing the edit are
+re-parsed and re-rendered; every untouched sibling map reuses its spans and
+its cached output.
+
+The emitted output and the reported error are exactly what a full
+NosjParser(...).parse() + Deserializer.process_map(...) run (as in main.py)
+would produce.
+"""
+
+import sys
+
+from .deserializer import KEY_PATTERN, Deserializer
+from .parser import NosjParser
+
+
+class ValueSpan:
+    """A leaf value and its position, relative to the enclosing map's start."""
+
+    __slots__ = ("offset", "length", "text")
+
+    def __init__(self, offset: int, length: int, text: str):
+        self.offset = offset
+        self.length = length
+        self.text = text
+
+
+class MapSpan:
+    """
+    A map and its position, relative to the enclosing map's start (or to the
+    document start for the root). `entries` mirrors the dict the plain parser
+    builds (same key order, last duplicate wins); `rendered` caches the body
+    text of this map, or `error` the first processing error inside it.
+    """
+
+    __slots__ = ("offset", "length", "entries", "rendered", "error")
+
+    def __init__(self, offset: int, length: int, entries: dict):
+        self.offset = offset
+        self.length = length
+        self.entries = entries
+        self.rendered = None
+        self.error = None
+
+
+class SpanParser(NosjParser):
+    """NosjParser that builds MapSpan / ValueSpan nodes instead of dicts/strs."""
+
+    def parse_map_at(self, pos: int) -> MapSpan:
+        self.i = pos
+        node = self._parse_map()
+        _relativize(node, 0)
+        return node
+
+    def _parse_map(self):
+        start = self.i
+        entries = super()._parse_map()
+        # Absolute offsets for now; _relativize() rebases the finished subtree.
+        return MapSpan(start, self.i - start, entries)
+
+    def _parse_value(self):
+        if self._peek_is('('):
+            return self._parse_map()
+        start = self.i
+        text = super()._parse_value()
+        return ValueSpan(start, self.i - start, text)
+
+
+def _relativize(node: MapSpan, base: int) -> None:
+    """Turn the absolute offsets of a freshly parsed subtree into relative ones."""
+    start = node.offset
+    node.offset = start - base
+    for child in node.entries.values():
+        if isinstance(child, MapSpan):
+            _relativize(child, start)
+        else:
+            child.offset -= start
+
+
+class IncrementalDocument:
+    """
+    A NOSJ document that can be re-deserialized cheaply after small edits.
+
+        doc = IncrementalDocument(text)
+        doc.update(new_text)                  # diff against the previous text
+        doc.apply_edits([(start, end, "..")]) # or explicit edit ranges
+        doc.output / doc.error                # same result as a full run
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.root = None          # MapSpan, or None if the text does not parse
+        self.parse_error = None
+        self.flat = None          # (output, error) when handled without a span tree
+        self.reparsed = 0         # characters re-parsed by the last change
+        self._full_parse()
+
+    # ---------------------------
+    # Edits
+    # ---------------------------
+    def update(self, new_text: str) -> None:
+        """Replace the document text; the changed region is found by diffing."""
+        old = self.text
+        limit = min(len(old), len(new_text))
+        p = 0
+        while p < limit and old[p] == new_text[p]:
+            p += 1
+        s = 0
+        while s < limit - p and old[-1 - s] == new_text[-1 - s]:
+            s += 1
+        self.reparsed = 0
+        if p == len(old) == len(new_text):
+            return
+        self._apply(p, len(old) - s, new_text[p:len(new_text) - s])
+
+    def apply_edits(self, edits) -> None:
+        """
+        Apply (start, end, replacement) edits given in current-text offsets.
+        Edits must not overlap; each one re-parses only its enclosing map.
+        """
+        ordered = sorted(edits, key=lambda e: (e[0], e[1]), reverse=True)
+        prev_start = None
+        for start, end, _ in ordered:
+            if not 0 <= start <= end <= len(self.text):
+                raise ValueError(f"Edit range out of bounds: {start}..{end}")
+            if prev_start is not None and end > prev_start:
+                raise ValueError(f"Overlapping edit ranges at {start}..{end}")
+            prev_start = start
+        self.reparsed = 0
+        # Right-to-left, so earlier offsets stay valid as later text shifts.
+        for start, end, replacement in ordered:
+            self._apply(start, end, replacement)
+
+    def _apply(self, start: int, end: int, replacement: str) -> None:
+        self.text = self.text[:start] + replacement + self.text[end:]
+        if self.root is None:
+            self._full_parse()
+            return
+
+        delta = len(replacement) - (end - start)
+
+        # Path from the root to the innermost map whose span covers the edit,
+        # as (node, absolute start, parent, key in parent).
+        path = [(self.root, self.root.offset, None, None)]
+        while True:
+            node, base, _, _ = path[-1]
+            for key, child in node.entries.items():
+                if isinstance(child, MapSpan):
+                    cstart = base + child.offset
+                    if cstart <= start and end <= cstart + child.length:
+                        path.append((child, cstart, node, key))
+                        break
+            else:
+                break
+
+        # Re-parse from the innermost map outwards until the new subtree ends
+        # exactly where the shifted old one did; the text around it is unchanged,
+        # so the enclosing parse continues identically.
+        for node, base, parent, key in reversed(path):
+            if parent is None:
+                break
+            new_node = self._reparse_at(base, base + node.length + delta)
+            if new_node is None:
+                continue
+            new_node.offset = node.offset
+            parent.entries[key] = new_node
+            self._shift_after(path, node, delta)
+            return
+
+        self._full_parse()
+
+    def _reparse_at(self, base: int, expected_end: int):
+        parser = SpanParser(self.text)
+        try:
+            node = parser.parse_map_at(base)
+        except Exception:
+            return None
+        self.reparsed += parser.i - base
+        if parser.i != expected_end:
+            return None
+        return node
+
+    def _shift_after(self, path: list, edited: MapSpan, delta: int) -> None:
+        """Grow every ancestor by delta and move the siblings after the edit."""
+        marker = edited
+        for node, _, parent, _ in reversed(path):
+            if node is not edited:
+                node.length += delta
+                node.rendered = None
+                node.error = None
+                for child in node.entries.values():
+                    if child is not marker and child.offset > marker.offset:
+                        child.offset += delta
+            marker = node
+
+    def _full_parse(self) -> None:
+        parser = SpanParser(self.text)
+        try:
+            parser._skip_outer_ws()
+            root = parser.parse_map_at(parser.i)
+            parser._skip_outer_ws()
+            if parser.i != parser.n:
+                parser._err("Trailing characters after top-level map")
+        except RecursionError:
+            self._fall_back_to_flat()
+        except Exception as e:
+            self.root = None
+            self.parse_error = str(e)
+            self.flat = None
+        else:
+            self.root = root
+            self.parse_error = None
+            self.flat = None
+        self.reparsed += len(self.text)
+
+    def _fall_back_to_flat(self) -> None:
+        """
+        The span tree needs more stack per nesting level than NosjParser and
+        render_map. Near the recursion limit, run the plain pipeline instead so
+        the result still matches a full run exactly; the next edit re-parses.
+        """
+        self.root = None
+        self.parse_error = None
+        try:
+            data = NosjParser(self.text).parse()
+            lines = Deserializer.render_map(data)
+        except Exception as e:
+            self.flat = (None, str(e))
+        else:
+            self.flat = ("begin-map\n" + "".join(line + "\n" for line in lines) + "end-map\n", None)
+
+    # ---------------------------
+    # Output
+    # ---------------------------
+    @property
+    def error(self):
+        """The 'ERROR -- ' message a full run would report, or None."""
+        if self.root is not None:
+            try:
+                self._render(self.root)
+            except RecursionError:
+                self._fall_back_to_flat()
+        if self.root is None:
+            return self.flat[1] if self.flat is not None else self.parse_error
+        return self.root.error
+
+    @property
+    def output(self):
+        """The exact stdout of a successful full run, or None if invalid."""
+        if self.error is not None:
+            return None
+        if self.root is None:
+            return self.flat[0]
+        return "begin-map\n" + self.root.rendered + "end-map\n"
+
+    def emit(self) -> None:
+        """Write the output to stdout, or report the error like main.py does."""
+        if self.error is not None:
+            Deserializer.handle_error(self.error)
+        sys.stdout.write(self.output)
+
+    def _render(self, node: MapSpan) -> None:
+        if node.rendered is not None or node.error is not None:
+            return
+        pieces = []
+        try:
+            for key, child in node.entries.items():
+                if not KEY_PATTERN.match(key):
+                    raise ValueError(f"Invalid key format: {key}")
+                if isinstance(child, MapSpan):
+                    self._render(child)
+                    if child.error is not None:
+                        node.error = child.error
+                        return
+                    pieces.append(f"{key} -- map -- \nbegin-map\n")
+                    pieces.append(child.rendered)
+                    pieces.append("end-map\n")
+                else:
+                    pieces.append(Deserializer.render_value(key, child.text) + "\n")
+        except RecursionError:
+            raise
+        except Exception as e:
+            node.error = str(e)
+            return
+        node.rendered = "".join(pieces)
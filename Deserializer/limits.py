@@ -0,0 +1,130 @@
+"""
+Resource budgets for parsing untrusted NOSJ input.
+
+Limits holds the configured ceilings (all optional; None = unlimited):
+
+    max_input_bytes   size of the input file
+    max_depth         map nesting depth (the top-level map is depth 1)
+    max_value_len     characters in a single leaf value
+    max_num_bits      bit-width of a binary num
+    max_entries       key:value pairs in the whole document
+    deadline          wall-clock seconds for the whole run
+
+Limits.start() hands out a Budget, the per-run counters that NosjParser and
+Deserializer check while they scan. Violations raise LimitExceeded (a
+ValueError), so they surface through the usual 'ERROR -- ' + exit(66) path.
+"""
+
+import os
+import re
+import time
+from typing import Optional
+
+# A num as the scanner accepts it (parser.py): the optional newline is not a bit.
+NUM_TOKEN = re.compile(r"[01]+\n?")
+
+
+class LimitExceeded(ValueError):
+    """Raised when input exceeds a configured resource budget."""
+
+
+class Limits:
+    FIELDS = (
+        "max_input_bytes",
+        "max_depth",
+        "max_value_len",
+        "max_num_bits",
+        "max_entries",
+        "deadline",
+    )
+
+    def __init__(
+        self,
+        max_input_bytes: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        max_value_len: Optional[int] = None,
+        max_num_bits: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ):
+        self.max_input_bytes = max_input_bytes
+        self.max_depth = max_depth
+        self.max_value_len = max_value_len
+        self.max_num_bits = max_num_bits
+        self.max_entries = max_entries
+        self.deadline = deadline
+
+    @classmethod
+    def from_env(cls, environ=None) -> "Limits":
+        """
+        Read limits from NOSJ_MAX_INPUT_BYTES, NOSJ_MAX_DEPTH, NOSJ_MAX_VALUE_LEN,
+        NOSJ_MAX_NUM_BITS, NOSJ_MAX_ENTRIES and NOSJ_DEADLINE (seconds).
+        Unset or empty variables mean "no limit".
+        """
+        environ = os.environ if environ is None else environ
+        kwargs = {}
+        for field in cls.FIELDS:
+            name = "NOSJ_" + field.upper()
+            raw = environ.get(name, "").strip()
+            if not raw:
+                continue
+            try:
+                value = float(raw) if field == "deadline" else int(raw)
+            except ValueError:
+                raise ValueError(f"Invalid {name}: {raw}") from None
+            if value <= 0:
+                raise ValueError(f"Invalid {name}: {raw}")
+            kwargs[field] = value
+        return cls(**kwargs)
+
+    def start(self) -> "Budget":
+        """Begin a run: the deadline clock starts now."""
+        return Budget(self)
+
+
+class Budget:
+    """Per-run counters checked against a Limits instance."""
+
+    # Deadline is polled once every this many entries to keep checks cheap.
+    DEADLINE_EVERY = 64
+
+    def __init__(self, limits: Limits, expires_at: Optional[float] = None):
+        self.limits = limits
+        self.entries = 0
+        if expires_at is None and limits.deadline is not None:
+            expires_at = time.monotonic() + limits.deadline
+        self.expires_at = expires_at
+
+    def renew(self) -> "Budget":
+        """Fresh counters for the next pass of the same run (same deadline)."""
+        return Budget(self.limits, self.expires_at)
+
+    def check_input(self, size: int) -> None:
+        limit = self.limits.max_input_bytes
+        if limit is not None and size > limit:
+            raise LimitExceeded(f"Input exceeds {limit} bytes")
+
+    def check_depth(self, depth: int) -> None:
+        limit = self.limits.max_depth
+        if limit is not None and depth > limit:
+            raise LimitExceeded(f"Map nesting exceeds depth {limit}")
+
+    def count_entry(self) -> None:
+        self.entries += 1
+        limit = self.limits.max_entries
+        if limit is not None and self.entries > limit:
+            raise LimitExceeded(f"Document exceeds {limit} entries")
+        if self.expires_at is not None and self.entries % self.DEADLINE_EVERY == 0:
+            self.check_deadline()
+
+    def check_value(self, val: str) -> None:
+        limit = self.limits.max_value_len
+        if limit is not None and len(val) > limit:
+            raise LimitExceeded(f"Value exceeds {limit} characters")
+        bits = self.limits.max_num_bits
+        if bits is not None and len(val) > bits and NUM_TOKEN.fullmatch(val) and len(val.rstrip("\n")) > bits:
+            raise LimitExceeded(f"Num exceeds {bits} bits")
+
+    def check_deadline(self) -> None:
+        if self.expires_at is not None and time.monotonic() > self.expires_at:
+            raise LimitExceeded(f"Deadline of {self.limits.deadline}s exceeded")
@@ -0,0 +1,52 @@
+"""
+Library-mode API: deserialize NOSJ straight to native Python values.
+
+    from Deserializer import loads, NosjError
+
+    loads("(<a:1010,b:(<c:abcds>)>)")   # -> {'a': -6, 'b': {'c': 'abcd'}}
+
+num -> int, string -> str, map -> dict (insertion-ordered). The three types
+never overlap, so no extra type tags are needed. Errors raise NosjError
+(str(err) is the same message the CLI prints) instead of writing to stderr
+and calling sys.exit(66), so the core is safe to use in long-lived processes.
+"""
+
+from typing import Optional
+
+from .deserializer import Deserializer, NosjError
+from .limits import LimitExceeded, Limits
+from .parser import NosjParser
+
+
+def loads(src: str, limits: Optional[Limits] = None) -> dict:
+    """Deserialize a NOSJ document held in a str."""
+    budget = limits.start() if limits is not None else None
+    parser = None
+    try:
+        parser = NosjParser(src, budget)
+        data = parser.parse()
+    except Exception as e:
+        kind = "limit" if isinstance(e, LimitExceeded) else "parse"
+        position = parser.i if parser is not None else None
+        raise NosjError(str(e), kind, position=position) from e
+    return Deserializer.decode_map(data, budget.renew() if budget is not None else None)
+
+
+def load(fp, limits: Optional[Limits] = None) -> dict:
+    """
+    Deserialize a NOSJ document from a file object (text, or bytes as UTF-8).
+    With limits.max_input_bytes set, at most that much (+1) is ever read.
+    """
+    if limits is not None and limits.max_input_bytes is not None:
+        src = fp.read(limits.max_input_bytes + 1)
+    else:
+        src = fp.read()
+    if isinstance(src, (bytes, bytearray)):
+        if limits is not None and limits.max_input_bytes is not None \
+                and len(src) > limits.max_input_bytes:
+            raise NosjError(f"Input exceeds {limits.max_input_bytes} bytes", "limit")
+        try:
+            src = bytes(src).decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise NosjError(str(e), "parse") from e
+    return loads(src, limits)
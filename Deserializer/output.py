@@ -0,0 +1,130 @@
+"""
+All-or-nothing output buffering for main.py.
+
+Nothing may reach stdout unless the whole document deserializes, so the
+rendered output is held until the end. SpillBuffer keeps small outputs in
+memory and, once they grow past a threshold, moves them to an anonymous
+temporary file, so huge documents do not need several times their size in RAM.
+On success copy_to() streams the buffer out with large block copies
+(os.sendfile where the kernel allows it, shutil.copyfileobj otherwise).
+"""
+
+import codecs
+import io
+import os
+import shutil
+import tempfile
+
+DEFAULT_SPILL_THRESHOLD = 8 * 1024 * 1024   # characters kept in memory
+COPY_BLOCK = 1024 * 1024
+
+
+class SpillBuffer:
+    """
+    Write-only text sink (usable with redirect_stdout) that spills to disk.
+
+    Spilled text is encoded immediately with the target stream's encoding, so
+    an unencodable character fails the run before anything is written.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_SPILL_THRESHOLD,
+                 encoding: str = "utf-8", errors: str = "strict"):
+        self.threshold = threshold
+        self.encoding = encoding or "utf-8"
+        self.errors = errors or "strict"
+        self._mem = io.StringIO()
+        self._mem_size = 0
+        self._file = None   # binary anonymous temp file once spilled
+
+    @staticmethod
+    def threshold_from_env(environ=None) -> int:
+        """NOSJ_SPILL_THRESHOLD (characters); unset means the default."""
+        environ = os.environ if environ is None else environ
+        raw = environ.get("NOSJ_SPILL_THRESHOLD", "").strip()
+        if not raw:
+            return DEFAULT_SPILL_THRESHOLD
+        try:
+            value = int(raw)
+        except ValueError:
+            raise ValueError(f"Invalid NOSJ_SPILL_THRESHOLD: {raw}") from None
+        if value < 0:
+            raise ValueError(f"Invalid NOSJ_SPILL_THRESHOLD: {raw}")
+        return value
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    def write(self, s: str) -> int:
+        if self._file is not None:
+            self._file.write(s.encode(self.encoding, self.errors))
+            return len(s)
+        self._mem.write(s)
+        self._mem_size += len(s)
+        if self._mem_size > self.threshold:
+            self._spill()
+        return len(s)
+
+    def flush(self) -> None:
+        pass
+
+    def _spill(self) -> None:
+        self._file = tempfile.TemporaryFile()
+        self._file.write(self._mem.getvalue().encode(self.encoding, self.errors))
+        self._mem = None
+
+    def getvalue(self) -> str:
+        """Whole buffered text (reads the spill file back if needed)."""
+        if self._file is None:
+            return self._mem.getvalue()
+        self._file.seek(0)
+        return self._file.read().decode(self.encoding, self.errors)
+
+    def copy_to(self, stream) -> None:
+        """Emit the buffered output to a text stream (normally sys.stdout)."""
+        if self._file is None:
+            stream.write(self._mem.getvalue())
+            return
+
+        stream.flush()
+        size = self._file.tell()
+        self._file.flush()
+        offset = 0
+        try:
+            out_fd = stream.fileno()
+            in_fd = self._file.fileno()
+            while offset < size:
+                sent = os.sendfile(out_fd, in_fd, offset, min(size - offset, 1 << 30))
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            # No real fd (captured stream) or sendfile not supported here.
+            pass
+        if offset >= size:
+            return
+
+        self._file.seek(offset)
+        target = getattr(stream, "buffer", None)
+        if target is not None:
+            shutil.copyfileobj(self._file, target, COPY_BLOCK)
+            target.flush()
+            return
+        decoder = codecs.getincrementaldecoder(self.encoding)(self.errors)
+        while True:
+            block = self._file.read(COPY_BLOCK)
+            stream.write(decoder.decode(block, final=not block))
+            if not block:
+                break
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._mem = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
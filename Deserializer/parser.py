@@ -0,0 +1,139 @@
+# ---------------- STRICT NOSJ PARSER (rubric-compliant) ----------------
+# Grammar:
+#   file  := WS? "(<" pairs? ">)" WS?
+#   pairs := pair ("," pair)*
+#   pair  := key ":" value
+#   key   := [a-z]+          (no whitespace allowed)
+#   value := map | strtoken
+#   map   := "(<" pairs? ">)"
+#   strtoken := sequence of ANY chars except ',' or '>' or ')'
+#               (may contain spaces, e.g. simple strings like "b s")
+#
+# Rules:
+# - No whitespace inside a map except inside a string token itself.
+# - Keys must be lowercase ascii only, no spaces allowed.
+# - Whitespace allowed only outside the top-level map or inside string tokens.
+#
+# Leaf values are classified while scanned and returned as typed tokens
+# (Deserializer/tokens.py) so the Deserializer does not re-classify them.
+#
+# An optional Budget (Deserializer/limits.py) bounds depth, entry count, value
+# length, num width and wall-clock time while scanning.
+
+import re
+
+try:
+    from .tokens import TOKEN_TYPES
+except ImportError:
+    from tokens import TOKEN_TYPES  # type: ignore
+
+# One pass over a leaf value: the first alternative that spans the whole token
+# (up to ',', '>', ')' or EOF) decides its type, in process_map's order.
+# The optional '\n' mirrors '$' in the original ^...$ patterns, which also
+# matches just before a trailing newline.
+_TERMINATOR = r"(?=[,>)]|\Z)"
+VALUE_TOKEN = re.compile(
+    r"(?P<num>[01]+\n?" + _TERMINATOR + r")"
+    r"|(?P<simple>[a-zA-Z0-9 \t]+s\n?" + _TERMINATOR + r")"
+    r"|(?P<complex>[^,>)]*)"
+)
+
+
+class NosjParser:
+    def __init__(self, src: str, budget=None):
+        self.s = src
+        self.i = 0
+        self.n = len(src)
+        self.depth = 0
+        self.budget = budget
+        if budget is not None:
+            # chars <= utf-8 bytes, so this never rejects an in-budget input
+            budget.check_input(self.n)
+
+    def parse(self):
+        self._skip_outer_ws()
+        obj = self._parse_map()
+        self._skip_outer_ws()
+        if self.i != self.n:
+            self._err("Trailing characters after top-level map")
+        return obj
+
+    def _parse_map(self):
+        self._expect('(')
+        self._expect('<')
+        self.depth += 1
+        if self.budget is not None:
+            self.budget.check_depth(self.depth)
+        result = {}
+        # Allow empty map "(<>)"
+        if self._peek_is('>'):
+            self._advance()
+            self._expect(')')
+            self.depth -= 1
+            return result
+
+        # parse first pair
+        k, v = self._parse_pair()
+        result[k] = v
+
+        # optional more pairs
+        while self._peek_is(','):
+            self._advance()
+            k, v = self._parse_pair()
+            result[k] = v
+
+        self._expect('>')
+        self._expect(')')
+        self.depth -= 1
+        return result
+
+    def _parse_pair(self):
+        if self.budget is not None:
+            self.budget.count_entry()
+        key = self._parse_key()
+        self._expect(':')
+        val = self._parse_value()
+        return key, val
+
+    def _parse_key(self):
+        start = self.i
+        while self.i < self.n and 'a' <= self.s[self.i] <= 'z':
+            self.i += 1
+        if self.i == start:
+            self._err("Expected lowercase key")
+        return self.s[start:self.i]
+
+    def _parse_value(self):
+        if self._peek_is('('):
+            return self._parse_map()
+        start = self.i
+        end = self.n
+        if self.budget is not None and self.budget.limits.max_value_len is not None:
+            # Stop one char past the limit instead of scanning a huge token.
+            end = min(end, start + self.budget.limits.max_value_len + 1)
+        m = VALUE_TOKEN.match(self.s, start, end)
+        self.i = m.end()
+        val = m.group()
+        if self.budget is not None:
+            self.budget.check_value(val)
+        return TOKEN_TYPES[m.lastgroup](val)
+
+    # ---------------- helpers ----------------
+    def _skip_outer_ws(self):
+        while self.i < self.n and self.s[self.i] in ' \t\r\n':
+            self.i += 1
+
+    def _peek_is(self, ch):
+        return self.i < self.n and self.s[self.i] == ch
+
+    def _expect(self, ch):
+        if not self._peek_is(ch):
+            got = self.s[self.i] if self.i < self.n else "EOF"
+            self._err(f"Expected '{ch}' but found '{got}'")
+        self.i += 1
+
+    def _advance(self):
+        self.i += 1
+
+    def _err(self, msg):
+        raise ValueError(f"NOSJ parse error: {msg}")
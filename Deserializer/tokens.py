@@ -0,0 +1,31 @@
+"""
+Typed leaf tokens produced by NosjParser.
+
+The scanner classifies every leaf value while it reads it, using the same
+precedence process_map has always applied (num, then simple string, then
+complex string). Each token is still a plain `str` subclass, so existing
+dict-based callers keep working; Deserializer.render_value recognizes the
+type and decodes without re-running the classification regexes.
+"""
+
+
+class NumToken(str):
+    """Value matching ^[01]+$ -- a two's complement binary num."""
+    __slots__ = ()
+
+
+class SimpleStrToken(str):
+    """Value matching ^[a-zA-Z0-9 \\t]+s$ -- a simple string."""
+    __slots__ = ()
+
+
+class ComplexStrToken(str):
+    """Anything else -- a complex (percent-encoded) string candidate."""
+    __slots__ = ()
+
+
+TOKEN_TYPES = {
+    "num": NumToken,
+    "simple": SimpleStrToken,
+    "complex": ComplexStrToken,
+}
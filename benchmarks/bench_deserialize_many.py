@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for Deserializer.batch.deserialize_many.
+
+Deserializes the same synthetic corpus with 1, 2, 4, ... worker threads and
+reports documents/s and speedup over one worker. Speedup above ~1x needs a
+free-threaded (no-GIL) CPython 3.13+ build; on a standard build the numbers
+show the thread-pool overhead instead.
+
+    python3 benchmarks/bench_deserialize_many.py --docs 2000 --entries 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from Deserializer.batch import deserialize_many  # noqa: E402
+
+
+def make_doc(rng: random.Random, entries: int, depth: int = 0) -> str:
+    pairs = []
+    for i in range(entries):
+        key = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(1, 8)))
+        roll = rng.random()
+        if roll < 0.05 and depth < 4:
+            val = make_doc(rng, max(1, entries // 8), depth + 1)
+        elif roll < 0.4:
+            val = "".join(rng.choice("01") for _ in range(rng.randint(1, 64)))
+        elif roll < 0.7:
+            val = "".join(rng.choice("abc xyz019") for _ in range(rng.randint(1, 30))) + "s"
+        else:
+            val = "ab%2Ccd%20" * rng.randint(1, 5)
+        pairs.append(f"{key}:{val}")
+    return "(<" + ",".join(pairs) + ">)"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark deserialize_many thread scaling.")
+    parser.add_argument("--docs", type=int, default=1000, help="Documents per run (default: 1000)")
+    parser.add_argument("--entries", type=int, default=100, help="Top-level entries per document (default: 100)")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1,
+                        help="Largest worker count in the sweep (default: CPU count)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per worker count; best is reported")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(5370)
+    docs = [make_doc(rng, args.entries) for _ in range(args.docs)]
+    total_bytes = sum(len(d) for d in docs)
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"python {sys.version.split()[0]}  gil={'on' if gil else 'off'}  cpus={os.cpu_count()}  "
+          f"docs={args.docs}  bytes={total_bytes:,}")
+
+    sweep = []
+    n = 1
+    while n < args.max_workers:
+        sweep.append(n)
+        n *= 2
+    sweep.append(args.max_workers)
+
+    base = None
+    for workers in sweep:
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            results = deserialize_many(docs, workers=workers)
+            best = min(best, time.perf_counter() - t0)
+        failed = sum(r.exit_code != 0 for r in results)
+        rate = args.docs / best
+        base = base or rate
+        print(f"workers={workers:<3} {rate:10.1f} docs/s  {total_bytes / best / 1e6:7.2f} MB/s  "
+              f"speedup={rate / base:5.2f}x  efficiency={rate / base / workers:5.1%}  failed={failed}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+In-process, mutation-based fuzz harness for NosjParser + Deserializer.
+
+Every exec used to go through main.py as a subprocess (tens of execs/s).
+This harness calls the parser and the deserializer directly, so it runs
+thousands of execs/s per core.
+
+- Seeds: spec-testcases/**/*.input and project1b/break-it/*.input.
+- Mutators: NOSJ-grammar-aware (insert/duplicate pairs, swap a value for a
+  num / simple / complex / broken string, nest values in maps, splice seeds,
+  insert structural tokens) plus plain byte-level edits.
+- Oracle (differential): for each input the typed render path
+  (Deserializer.render_map on the scanner's tokens), the plain-str render
+  path, the native-value path (Deserializer.decode_map, re-rendered) and the
+  incremental path (IncrementalDocument) must agree on output or on the
+  error message. Any exception that is not a ValueError (or the known
+  RecursionError on deep nesting) is a crash.
+- Timeouts: each exec runs under a SIGALRM interval timer.
+- Findings are minimized (delta debugging, preserving the failure signature)
+  and written to <out>/crashes/ and <out>/timeouts/.
+
+    python3 fuzz_nosj.py --duration 60 --out fuzz-out
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import random
+import signal
+import sys
+import time
+import traceback
+
+from Deserializer.deserializer import Deserializer
+from Deserializer.incremental import IncrementalDocument
+from Deserializer.parser import NosjParser
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SEED_GLOBS = ["spec-testcases/**/*.input", "project1b/break-it/*.input"]
+
+KEY_CHARS = "abcdefghijklmnopqrstuvwxyz"
+TOKENS = ["(<", ">)", "(", ")", "<", ">", ",", ":", "%", "%2C", "%20", "%00", "%GZ",
+          "s", " ", "\t", "\n", "\r", "è", "0", "1", "A", "%C3%A8", "\x00"]
+
+
+class ExecTimeout(BaseException):
+    """
+    Raised by the SIGALRM handler when one exec exceeds its time budget. A
+    BaseException, so the library's `except Exception` handlers cannot turn a
+    timeout into an error result (and a bogus differential mismatch).
+    """
+
+
+# ---------------------------
+# Oracle
+# ---------------------------
+def _plain(data):
+    return {k: _plain(v) if isinstance(v, dict) else str(v) for k, v in data.items()}
+
+
+def _render_native(data, lines):
+    for key, val in data.items():
+        if isinstance(val, dict):
+            lines.append(f"{key} -- map -- ")
+            lines.append("begin-map")
+            _render_native(val, lines)
+            lines.append("end-map")
+        elif isinstance(val, int):
+            lines.append(f"{key} -- num -- {val}")
+        else:
+            lines.append(f"{key} -- string -- {val}")
+    return lines
+
+
+RECURSION = "maximum recursion depth exceeded"
+
+
+def _norm(err):
+    # RecursionError text depends on where the limit hit ("... in comparison",
+    # "... while calling a Python object"); every path reports it, so compare
+    # only the common prefix.
+    if err is not None and err.startswith(RECURSION):
+        return RECURSION
+    return err
+
+
+def _outcome(fn, *args):
+    """(output, None) or (None, error message); unexpected exceptions propagate."""
+    try:
+        return fn(*args), None
+    except RecursionError:
+        return None, RECURSION
+    except ValueError as e:
+        return None, str(e)
+
+
+def _wrap(lines):
+    return "begin-map\n" + "".join(line + "\n" for line in lines) + "end-map\n"
+
+
+def check(src: str) -> str:
+    """
+    Run one input through every path. Returns a short behaviour signature
+    (used as feedback for the corpus); raises AssertionError on a
+    differential mismatch and lets crashes propagate.
+    """
+    data, err = _outcome(lambda: NosjParser(src).parse())
+    incremental = IncrementalDocument(src)
+    inc = (incremental.output, _norm(incremental.error))
+    if err is not None:
+        assert inc[1] == err, f"incremental parse error {inc[1]!r} != {err!r}"
+        return "parse:" + err.split("'")[0][:60]
+
+    typed, terr = _outcome(lambda: _wrap(Deserializer.render_map(data)))
+    plain, perr = _outcome(lambda: _wrap(Deserializer.render_map(_plain(data))))
+    native, nerr = _outcome(lambda: _wrap(_render_native(Deserializer.decode_map(data), [])))
+
+    assert (typed, terr) == (plain, perr), f"typed {(typed, terr)!r} != plain {(plain, perr)!r}"
+    assert (typed, terr) == (native, nerr), f"render {(typed, terr)!r} != load {(native, nerr)!r}"
+    assert (typed, terr) == inc, f"full {(typed, terr)!r} != incremental {inc!r}"
+
+    if terr is not None:
+        return "value:" + terr.split(":")[0][:40]
+    # Bucket sizes (log2) so the corpus keeps shapes, not every distinct size.
+    return f"ok:{typed.count('begin-map').bit_length()}:{len(data).bit_length()}"
+
+
+# ---------------------------
+# Mutators
+# ---------------------------
+def _rand_key(rng):
+    return "".join(rng.choice(KEY_CHARS) for _ in range(rng.randint(1, 4)))
+
+
+def _rand_value(rng, depth=0):
+    roll = rng.randint(0, 7)
+    if roll == 0:
+        return "".join(rng.choice("01") for _ in range(rng.randint(1, 70)))
+    if roll == 1:
+        return "".join(rng.choice("abcXYZ09 \t") for _ in range(rng.randint(1, 12))) + "s"
+    if roll == 2:
+        return "".join(rng.choice(["a", "%2C", "%20", "%7e", "Z", "%C3%A8"]) for _ in range(rng.randint(1, 6)))
+    if roll == 3:
+        return rng.choice(["", "s", "%", "%G", "%2", "è%20", "ab\ncd%20", "1010\n", "abs\n"])
+    if roll == 4 and depth < 3:
+        return _rand_map(rng, depth + 1)
+    return "".join(rng.choice(TOKENS) for _ in range(rng.randint(1, 4)))
+
+
+def _rand_map(rng, depth=0):
+    pairs = [f"{_rand_key(rng)}:{_rand_value(rng, depth)}" for _ in range(rng.randint(0, 3))]
+    return "(<" + ",".join(pairs) + ">)"
+
+
+def _pair_starts(src):
+    return [i + 1 for i, ch in enumerate(src) if ch in "<,"]
+
+
+def _value_spans(src):
+    spans = []
+    for i, ch in enumerate(src):
+        if ch == ":":
+            j = i + 1
+            while j < len(src) and src[j] not in ",>)(":
+                j += 1
+            spans.append((i + 1, j))
+    return spans
+
+
+def mutate(src: str, rng: random.Random, corpus) -> str:
+    n = len(src)
+    choice = rng.randint(0, 11)
+    if choice == 0:                                   # insert a pair
+        starts = _pair_starts(src) or [0]
+        i = rng.choice(starts)
+        return src[:i] + f"{_rand_key(rng)}:{_rand_value(rng)}," + src[i:]
+    if choice == 1:                                   # replace a value
+        spans = _value_spans(src)
+        if spans:
+            a, b = rng.choice(spans)
+            return src[:a] + _rand_value(rng) + src[b:]
+    if choice == 2:                                   # nest a value in a map
+        spans = _value_spans(src)
+        if spans:
+            a, b = rng.choice(spans)
+            return src[:a] + f"(<{_rand_key(rng)}:" + src[a:b] + ">)" + src[b:]
+    if choice == 3:                                   # duplicate a key
+        spans = _value_spans(src)
+        if spans:
+            a, b = rng.choice(spans)
+            k = a - 1
+            while k > 0 and src[k - 1] in KEY_CHARS:
+                k -= 1
+            return src[:b] + "," + src[k:b] + src[b:]
+    if choice == 4:                                   # splice another corpus entry
+        other = rng.choice(corpus)
+        i, j = rng.randint(0, n), rng.randint(0, len(other))
+        return src[:i] + other[j:]
+    if choice == 5:                                   # deep nesting
+        depth = rng.choice([2, 4, 8, 16, 400])
+        return "(<a:" * depth + "1" + ">)" * depth
+    if choice == 6:                                   # whole fresh document
+        return _rand_map(rng)
+    if choice == 7 and n:                             # delete a range
+        i = rng.randrange(n)
+        return src[:i] + src[i + rng.randint(1, 8):]
+    if choice == 8 and n:                             # duplicate a range
+        i = rng.randrange(n)
+        j = min(n, i + rng.randint(1, 16))
+        return src[:j] + src[i:j] + src[j:]
+    if choice == 9 and n:                             # replace one char
+        i = rng.randrange(n)
+        return src[:i] + chr(rng.choice([rng.randint(0, 127), rng.randint(128, 0x2FF)])) + src[i + 1:]
+    if choice == 10:                                  # outer whitespace / trailing junk
+        return rng.choice([" ", "\n", "\t", "\r\n", "x", ""]) + src + rng.choice([" ", "\n", "junk", ">)", ""])
+    i = rng.randint(0, n)                             # insert a structural token
+    return src[:i] + rng.choice(TOKENS) + src[i:]
+
+
+# ---------------------------
+# Execution, minimization
+# ---------------------------
+def _on_alarm(signum, frame):
+    raise ExecTimeout()
+
+
+def run_one(src: str, timeout: float):
+    """
+    Returns (kind, signature, detail): kind is 'ok', 'crash', 'mismatch' or 'timeout'.
+    A nonzero timeout installs the SIGALRM handler for the duration of the
+    exec (main thread only) and restores the caller's handler afterwards.
+    """
+    previous = None
+    if timeout:
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        sig = check(src)
+        return "ok", sig, None
+    except ExecTimeout:
+        return "timeout", "timeout", None
+    except AssertionError as e:
+        return "mismatch", "mismatch:" + str(e).split(" ", 1)[0], str(e)
+    except Exception as e:
+        tb = traceback.extract_tb(e.__traceback__)[-1]
+        return "crash", f"crash:{type(e).__name__}:{os.path.basename(tb.filename)}:{tb.lineno}", \
+            traceback.format_exc()
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, signal.SIG_DFL if previous is None else previous)
+
+
+def minimize(src: str, signature: str, timeout: float, budget: int = 2000) -> str:
+    """Delta debugging: drop chunks while run_one keeps the same signature."""
+    chunk = max(1, len(src) // 2)
+    while chunk >= 1 and budget > 0:
+        i = 0
+        changed = False
+        while i < len(src) and budget > 0:
+            candidate = src[:i] + src[i + chunk:]
+            budget -= 1
+            if run_one(candidate, timeout)[1] == signature:
+                src = candidate
+                changed = True
+            else:
+                i += chunk
+        if not changed:
+            chunk //= 2
+    return src
+
+
+def load_seeds(root: str = HERE):
+    seeds = []
+    for pattern in SEED_GLOBS:
+        for path in sorted(glob.glob(os.path.join(root, pattern), recursive=True)):
+            with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+                seeds.append(f.read())
+    return seeds or ["(<a:1010>)"]
+
+
+def save_finding(out_dir, kind, src, minimized, detail):
+    folder = os.path.join(out_dir, "timeouts" if kind == "timeout" else "crashes")
+    os.makedirs(folder, exist_ok=True)
+    name = hashlib.sha256(minimized.encode("utf-8", "surrogatepass")).hexdigest()[:16]
+    for suffix, text in ((".input", src), (".min.input", minimized), (".txt", detail or kind)):
+        with open(os.path.join(folder, name + suffix), "w", encoding="utf-8",
+                  errors="surrogatepass", newline="") as f:
+            f.write(text)
+    return os.path.join(folder, name)
+
+
+def fuzz(runs=None, duration=None, seed=None, timeout=1.0, max_len=1024, out_dir=None,
+         report_every=5.0, log=sys.stderr):
+    rng = random.Random(seed)
+    corpus = load_seeds()
+    seen = {run_one(s, timeout)[1] for s in corpus}
+    findings = {}
+    execs = 0
+    t0 = last = time.perf_counter()
+    while (runs is None or execs < runs) and (duration is None or time.perf_counter() - t0 < duration):
+        src = rng.choice(corpus)
+        for _ in range(rng.randint(1, 4)):
+            src = mutate(src, rng, corpus)
+        src = src[:max_len]
+        kind, sig, detail = run_one(src, timeout)
+        execs += 1
+        if kind == "ok":
+            if sig not in seen:
+                seen.add(sig)
+                corpus.append(src)
+        elif sig not in findings:
+            minimized = minimize(src, sig, timeout)
+            findings[sig] = minimized
+            where = save_finding(out_dir, kind, src, minimized, detail) if out_dir else ""
+            print(f"[{kind}] {sig} min={minimized!r} {where}", file=log)
+        now = time.perf_counter()
+        if report_every and now - last >= report_every:
+            last = now
+            print(f"execs={execs:,} exec/s={execs / (now - t0):,.0f} corpus={len(corpus)} "
+                  f"findings={len(findings)}", file=log)
+    elapsed = time.perf_counter() - t0
+    return {"execs": execs, "seconds": elapsed, "exec_per_s": execs / elapsed if elapsed else 0.0,
+            "corpus": len(corpus), "findings": findings}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="In-process mutation fuzzer for the NOSJ deserializer.")
+    parser.add_argument("--runs", type=int, help="stop after N execs")
+    parser.add_argument("--duration", type=float, help="stop after S seconds (default: 30 if --runs not given)")
+    parser.add_argument("--seed", type=int, help="RNG seed for reproducible campaigns")
+    parser.add_argument("--timeout", type=float, default=1.0, help="seconds per exec before it counts as a hang")
+    parser.add_argument("--max-len", type=int, default=1024, help="truncate mutated inputs to this length")
+    parser.add_argument("--out", default="fuzz-out", help="directory for crashes/ and timeouts/")
+    args = parser.parse_args(argv)
+    if args.runs is None and args.duration is None:
+        args.duration = 30.0
+
+    stats = fuzz(args.runs, args.duration, args.seed, args.timeout, args.max_len, args.out)
+    print(f"done: execs={stats['execs']:,} in {stats['seconds']:.1f}s "
+          f"({stats['exec_per_s']:,.0f} exec/s), corpus={stats['corpus']}, "
+          f"findings={len(stats['findings'])}")
+    return 1 if stats["findings"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import sys
 import os
-import io
 from contextlib import redirect_stdout
 
 # --- normalize line endings so auto-runner byte compare passes ---
@@ -14,109 +13,15 @@ except Exception:
 # --- robust import for Deserializer ---
 try:
     from Deserializer.deserializer import Deserializer
+    from Deserializer.parser import NosjParser
+    from Deserializer.limits import Limits
+    from Deserializer.output import SpillBuffer
 except ImportError:
     sys.path.append(os.path.join(os.path.dirname(__file__), "Deserializer"))
     from deserializer import Deserializer  # type: ignore
-
-
-# ---------------- STRICT NOSJ PARSER (rubric-compliant) ----------------
-# Grammar:
-#   file  := WS? "(<" pairs? ">)" WS?
-#   pairs := pair ("," pair)*
-#   pair  := key ":" value
-#   key   := [a-z]+          (no whitespace allowed)
-#   value := map | strtoken
-#   map   := "(<" pairs? ">)"
-#   strtoken := sequence of ANY chars except ',' or '>' or ')'
-#               (may contain spaces, e.g. simple strings like "b s")
-#
-# Rules:
-# - No whitespace inside a map except inside a string token itself.
-# - Keys must be lowercase ascii only, no spaces allowed.
-# - Whitespace allowed only outside the top-level map or inside string tokens.
-
-class NosjParser:
-    def __init__(self, src: str):
-        self.s = src
-        self.i = 0
-        self.n = len(src)
-
-    def parse(self):
-        self._skip_outer_ws()
-        obj = self._parse_map()
-        self._skip_outer_ws()
-        if self.i != self.n:
-            self._err("Trailing characters after top-level map")
-        return obj
-
-    def _parse_map(self):
-        self._expect('(')
-        self._expect('<')
-        result = {}
-        # Allow empty map "(<>)"
-        if self._peek_is('>'):
-            self._advance()
-            self._expect(')')
-            return result
-
-        # parse first pair
-        k, v = self._parse_pair()
-        result[k] = v
-
-        # optional more pairs
-        while self._peek_is(','):
-            self._advance()
-            k, v = self._parse_pair()
-            result[k] = v
-
-        self._expect('>')
-        self._expect(')')
-        return result
-
-    def _parse_pair(self):
-        key = self._parse_key()
-        self._expect(':')
-        val = self._parse_value()
-        return key, val
-
-    def _parse_key(self):
-        start = self.i
-        while self.i < self.n and 'a' <= self.s[self.i] <= 'z':
-            self.i += 1
-        if self.i == start:
-            self._err("Expected lowercase key")
-        return self.s[start:self.i]
-
-    def _parse_value(self):
-        if self._peek_is('('):
-            return self._parse_map()
-        start = self.i
-        while self.i < self.n:
-            ch = self.s[self.i]
-            if ch in ',>)':
-                break
-            self.i += 1
-        return self.s[start:self.i]
-
-    # ---------------- helpers ----------------
-    def _skip_outer_ws(self):
-        while self.i < self.n and self.s[self.i] in ' \t\r\n':
-            self.i += 1
-
-    def _peek_is(self, ch):
-        return self.i < self.n and self.s[self.i] == ch
-
-    def _expect(self, ch):
-        if not self._peek_is(ch):
-            got = self.s[self.i] if self.i < self.n else "EOF"
-            self._err(f"Expected '{ch}' but found '{got}'")
-        self.i += 1
-
-    def _advance(self):
-        self.i += 1
-
-    def _err(self, msg):
-        raise ValueError(f"NOSJ parse error: {msg}")
+    from parser import NosjParser  # type: ignore
+    from limits import Limits  # type: ignore
+    from output import SpillBuffer  # type: ignore
 
 
 # ---------------- CLI wrapper ----------------
@@ -125,20 +30,36 @@ def main():
         Deserializer.handle_error("Usage: main.py <inputfile>")
 
     try:
-        with open(sys.argv[1], "r", newline="") as f:
-            src = f.read()
+        # Resource budgets (NOSJ_MAX_* / NOSJ_DEADLINE env vars, see limits.py)
+        limits = Limits.from_env()
+        budget = limits.start()
 
-        data = NosjParser(src).parse()
+        with open(sys.argv[1], "r", newline="") as f:
+            if limits.max_input_bytes is None:
+                src = f.read()
+            else:
+                size = os.fstat(f.fileno()).st_size
+                budget.check_input(size)
+                # st_size is 0 for pipes; never read more than the budget allows.
+                # The limit is in bytes, so read bytes and decode afterwards.
+                raw = f.buffer.read(limits.max_input_bytes + 1)
+                budget.check_input(len(raw))
+                src = raw.decode(f.encoding, f.errors)    # newline="": no translation to undo
+
+        data = NosjParser(src, budget).parse()
 
         # Buffer all processed output; only print if everything succeeds.
-        buf = io.StringIO()
-        with redirect_stdout(buf):
-            Deserializer.process_map(data)
-
-        # Success: now emit the wrapped output to real stdout.
-        print("begin-map")
-        sys.stdout.write(buf.getvalue())
-        print("end-map")
+        # Large outputs spill to an anonymous temp file (NOSJ_SPILL_THRESHOLD).
+        with SpillBuffer(SpillBuffer.threshold_from_env(),
+                         encoding=getattr(sys.stdout, "encoding", None),
+                         errors=getattr(sys.stdout, "errors", None)) as buf:
+            buf.write("begin-map\n")
+            with redirect_stdout(buf):
+                Deserializer.process_map(data, budget.renew())
+            buf.write("end-map\n")
+
+            # Success: now emit the wrapped output to real stdout.
+            buf.copy_to(sys.stdout)
 
     except SystemExit:
         # already handled via Deserializer.handle_error
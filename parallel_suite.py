@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Parallel, incremental spec-suite runner.
+
+- Discovers every *.input under the given roots (default: spec-testcases/).
+  A case is valid when a sibling .output exists, invalid otherwise.
+- Runs cases end-to-end (./main.py in a fresh interpreter, or 'make run' with
+  --make) on a pool of workers, each with a per-case timeout.
+- Caches results keyed by the hash of the input, the expected output, the
+  deserializer sources and the NOSJ_* environment; unchanged cases are
+  skipped on re-run (--no-cache to force).
+- Pass/fail rules are those of run_suite.py. Writes a JSON report with
+  per-case durations (--report) and lists the slowest cases.
+
+    python3 parallel_suite.py --jobs 8 --timeout 10 --report suite-report.json
+"""
+import argparse, glob, hashlib, json, os, subprocess, sys, time
+from concurrent.futures import ThreadPoolExecutor
+
+from run_suite import check_result, fwd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(HERE, ".suite-cache.json")
+SOURCES = ["main.py", "Makefile", "Deserializer/*.py"]
+
+def discover(roots):
+    """Return [(input_path, expected_path_or_None)] sorted by path."""
+    cases = []
+    for root in roots:
+        for ip in glob.glob(os.path.join(root, "**", "*.input"), recursive=True):
+            op = ip[:-len(".input")] + ".output"
+            cases.append((ip, op if os.path.exists(op) else None))
+    return sorted(cases)
+
+def sources_digest():
+    h = hashlib.sha256()
+    for pattern in SOURCES:
+        for path in sorted(glob.glob(os.path.join(HERE, pattern))):
+            h.update(os.path.relpath(path, HERE).encode())
+            with open(path, "rb") as f:
+                h.update(hashlib.sha256(f.read()).digest())
+    # Resource limits / buffering are configured through the environment.
+    for name in sorted(k for k in os.environ if k.startswith("NOSJ_")):
+        h.update(f"{name}={os.environ[name]}".encode())
+    return h.hexdigest()
+
+def case_key(input_path, expected_path, src_digest):
+    h = hashlib.sha256(src_digest.encode())
+    with open(input_path, "rb") as f:
+        h.update(hashlib.sha256(f.read()).digest())
+    if expected_path:
+        with open(expected_path, "rb") as f:
+            h.update(hashlib.sha256(f.read()).digest())
+    else:
+        h.update(b"<invalid>")
+    return h.hexdigest()
+
+def load_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(path, cache):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(cache, f, indent=0, sort_keys=True)
+    os.replace(tmp, path)
+
+def run_case(input_path, expected_path, timeout, use_make):
+    if use_make:
+        cmd = ["make", "-s", "-C", HERE, "run", f"FILE={fwd(os.path.abspath(input_path))}"]
+    else:
+        cmd = [sys.executable, os.path.join(HERE, "main.py"), input_path]
+    t0 = time.perf_counter()
+    try:
+        p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return "timeout", time.perf_counter() - t0, [f"exceeded {timeout}s"]
+    duration = time.perf_counter() - t0
+    exp = None
+    if expected_path:
+        with open(expected_path, "rb") as f:
+            exp = f.read()
+    ok, detail = check_result(p.stdout, p.stderr, p.returncode, exp)
+    return ("pass" if ok else "fail"), duration, detail
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run NOSJ testcases in parallel with result caching.")
+    parser.add_argument("roots", nargs="*", default=["spec-testcases"],
+                        help="directories to search for *.input (default: spec-testcases)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="parallel workers (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds allowed per case (default: 10)")
+    parser.add_argument("--make", action="store_true", help="run cases via 'make run' instead of ./main.py")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the result cache")
+    parser.add_argument("--cache", default=CACHE_PATH, help="cache file (default: .suite-cache.json)")
+    parser.add_argument("--report", help="write a JSON report to this path")
+    parser.add_argument("--slowest", type=int, default=5, help="number of slowest cases to list (default: 5)")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    cases = discover(args.roots)
+    digest = sources_digest() + ("|make" if args.make else "")
+    cache = {} if args.no_cache else load_cache(args.cache)
+
+    results, todo = [], []
+    for ip, op in cases:
+        key = case_key(ip, op, digest)
+        hit = cache.get(key)
+        entry = {"name": os.path.relpath(ip), "kind": "valid" if op else "invalid", "key": key}
+        if hit is not None:
+            entry.update(status=hit["status"], duration_ms=hit["duration_ms"], cached=True, detail=hit["detail"])
+            results.append(entry)
+        else:
+            todo.append((entry, ip, op))
+
+    def work(item):
+        entry, ip, op = item
+        status, duration, detail = run_case(ip, op, args.timeout, args.make)
+        entry.update(status=status, duration_ms=round(duration * 1000, 3), cached=False, detail=detail)
+        return entry
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        results.extend(pool.map(work, todo))
+
+    # Keep only the current cases; timeouts may be load-dependent, so retry them.
+    cache = {e["key"]: {k: e[k] for k in ("status", "duration_ms", "detail")}
+             for e in results if e["status"] != "timeout"}
+
+    results.sort(key=lambda e: e["name"])
+    for entry in results:
+        label = "OK" if entry["status"] == "pass" else entry["status"].upper()
+        note = " (cached)" if entry["cached"] else ""
+        print(f"{label} -- {entry['name']} ({entry['duration_ms']:.2f} ms){note}")
+        if entry["status"] != "pass":
+            for line in entry["detail"]:
+                print(f"  {line}")
+
+    counts = {s: sum(e["status"] == s for e in results) for s in ("pass", "fail", "timeout")}
+    ran = sum(not e["cached"] for e in results)
+    wall = time.perf_counter() - t0
+    slowest = sorted(results, key=lambda e: e["duration_ms"], reverse=True)[:args.slowest]
+    print(f"{len(results)} cases: {counts['pass']} passed, {counts['fail']} failed, "
+          f"{counts['timeout']} timed out; {ran} run, {len(results) - ran} cached; {wall:.2f}s wall")
+    if slowest:
+        print("slowest:")
+        for e in slowest:
+            print(f"  {e['duration_ms']:9.2f} ms  {e['name']}")
+
+    if not args.no_cache:
+        save_cache(args.cache, cache)
+    if args.report:
+        report = {
+            "summary": dict(counts, total=len(results), run=ran, cached=len(results) - ran,
+                            wall_s=round(wall, 3), jobs=args.jobs, timeout_s=args.timeout),
+            "slowest": [e["name"] for e in slowest],
+            "cases": [{k: v for k, v in e.items() if k != "key"} for e in results],
+        }
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(0 if counts["fail"] == counts["timeout"] == 0 else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Per-machine autotuning for the in-memory engines (collision_sha256.py --autotune).
+
+Briefly runs each candidate configuration (threads / processes / numpy engine,
+worker count, batch size) at a width that will not collide, with the table
+sized as the real search would size it, and keeps the fastest by hashes/s.
+The choice is cached in a JSON file keyed by host, CPU count, Python version,
+hash algorithm, width and table size, so later runs reuse it without
+measuring (--retune measures again). A cached numpy winner is skipped in
+favour of the best cached alternative when NumPy is no longer importable.
+"""
+
+import json
+import os
+import platform
+import time
+from typing import Callable, List, Optional
+
+from bench import budget
+from engine import eprint
+
+TUNE_WIDTH = 8            # wide enough that a short run never collides
+
+def default_cache_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "partial-collision", "autotune.json")
+
+
+def machine_key(algo: str, width: int, table_mb: int) -> str:
+    return "|".join([platform.node(), platform.machine(), platform.python_implementation(),
+                     platform.python_version(), str(os.cpu_count() or 1), algo,
+                     f"{width}B", f"{table_mb}MiB"])
+
+
+def candidates(cpus: int, have_numpy: bool) -> List[dict]:
+    """Configurations worth measuring on a machine with `cpus` CPUs."""
+    workers = sorted({1, 2, 4, 8, 16, 32, 64, cpus} & set(range(1, cpus + 1)) | {1})
+    configs = [{"engine": "threads", "workers": n, "batch_size": b}
+               for n in sorted({1, cpus}) for b in (1024, 4096, 16384)]
+    configs += [{"engine": "processes", "workers": n, "batch_size": None} for n in workers]
+    if have_numpy:
+        configs += [{"engine": "numpy", "workers": 1, "batch_size": b} for b in (16384, 65536)]
+    return configs
+
+
+def measure(build: Callable, configs: List[dict], seconds: float) -> List[dict]:
+    results = []
+    for cfg in configs:
+        finder = build(cfg["engine"], TUNE_WIDTH, cfg["workers"], cfg["batch_size"])
+        finder.tick = budget(seconds, None)
+        finder.run()
+        rate = finder.stats()["hashes_per_s"]
+        results.append(dict(cfg, hashes_per_s=rate))
+        eprint(f"  {cfg['engine']:9} workers={cfg['workers']:<3} "
+               f"batch={cfg['batch_size'] or '-':<6} {rate:>12,.0f} h/s")
+    return results
+
+
+def load_cache(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(path: str, cache: dict):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def autotune(build: Callable, algo: str, have_numpy: bool, width: int, table_mb: int,
+             seconds: float = 0.5, path: Optional[str] = None, retune: bool = False) -> dict:
+    """
+    Return {"engine", "workers", "batch_size", "hashes_per_s"} for this machine
+    and a search at `width` bytes with a `table_mb` table, from the cache
+    unless `retune` or no usable entry exists.
+    """
+    path = path or default_cache_path()
+    cache = load_cache(path)
+    key = machine_key(algo, width, table_mb)
+    usable = [] if retune or key not in cache else \
+        [r for r in cache[key]["results"] if have_numpy or r["engine"] != "numpy"]
+    if usable:
+        best = max(usable, key=lambda r: r["hashes_per_s"])
+        eprint(f"Autotune: cached {best['engine']} workers={best['workers']} "
+               f"batch={best['batch_size']} ({best['hashes_per_s']:,.0f} h/s) from {path}")
+        return best
+
+    eprint(f"Autotune: measuring {algo} for {seconds:g}s per configuration...")
+    results = measure(build, candidates(os.cpu_count() or 1, have_numpy), seconds)
+    best = max(results, key=lambda r: r["hashes_per_s"])
+    cache[key] = {"best": best, "results": results, "measured_at": round(time.time())}
+    save_cache(path, cache)
+    eprint(f"Autotune: picked {best['engine']} workers={best['workers']} batch={best['batch_size']}; "
+           f"cached in {path}")
+    return best
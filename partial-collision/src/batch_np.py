@@ -0,0 +1,147 @@
+"""
+NumPy-vectorized batch collision search (collision_sha256.py --numpy).
+
+The per-hash Python work in the table engines is the probe: hashing the key,
+walking slots, comparing tags. Here one loop only hashes a batch of
+candidates into a single bytes block (CandidateSpace.suffix_block); the
+block becomes a uint64 key array, and everything else is vectorized:
+
+- within the batch: np.unique(..., return_index, return_counts) finds keys
+  that occur more than once;
+- against earlier batches: np.searchsorted into each stored level, a sorted
+  key array with a parallel array of candidate ids, finds keys seen before;
+- the batch then becomes a new level-0 run, and runs of equal level are
+  merged one level up (a binary counter, as in spill.py). Every stored
+  candidate is re-sorted O(log(M / batch)) times and a batch is searched
+  against O(log(M / batch)) levels, instead of re-sorting all M stored keys
+  per batch.
+
+Keys are the low 8 bytes of the digest suffix, so for --bytes <= 8 a key
+match is a suffix match; every hit is still confirmed by regenerating the
+candidates. Memory is 16 bytes per stored candidate; once --table-mb worth
+of candidates is stored, later batches are still searched but not stored
+(like a full CompactTable).
+
+NumPy is optional: this module imports without it, and the finder raises a
+clear error when it is missing.
+"""
+
+import sys
+import time
+from typing import Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from candidates import CandidateSpace, make_id
+from engine import BaseCollisionFinder
+from telemetry import engine_stats
+
+ENTRY_BYTES = 16           # uint64 key + uint64 candidate id
+
+
+class NumpyCollisionFinder(BaseCollisionFinder):
+    """Birthday search that finds duplicates with vectorized NumPy batches."""
+
+    def __init__(self, email: bytes, last_n: int = 4, progress_every: int = 200_000,
+                 batch_size: int = 1 << 16, table_mb: int = 512, algo: str = "sha256"):
+        if np is None:
+            raise RuntimeError("--numpy requires NumPy (pip install numpy).")
+        super().__init__(email, last_n, progress_every, algo)
+        self.batch_size = max(2, batch_size)
+        self.capacity = max(self.batch_size, (table_mb << 20) // ENTRY_BYTES)
+        self.space = CandidateSpace(self._prefix(), last_n, self.run_salt, algo)
+        # Sorted runs [level, keys, ids] (ids[i] is the candidate of keys[i]); levels
+        # strictly decrease from the oldest run to the newest.
+        self.levels = []
+        self.stored = 0
+        self.counts = [0]
+
+    @property
+    def table_bytes(self) -> int:
+        return sum(keys.nbytes + ids.nbytes for _, keys, ids in self.levels)
+
+    def stats(self) -> dict:
+        return engine_stats("numpy", self.started, self.counts, self.last_n,
+                            table_bytes=self.table_bytes, entries=self.stored, found_at=self.found_at)
+
+    def _keys(self, block: bytes, count: int):
+        """uint64 keys from `count` concatenated N-byte suffixes (low 8 bytes, little-endian)."""
+        n = self.last_n
+        raw = np.frombuffer(block, dtype=np.uint8).reshape(count, n)
+        if n >= 8:
+            return np.ascontiguousarray(raw[:, n - 8:]).view('<u8').ravel().astype(np.uint64)
+        padded = np.zeros((count, 8), dtype=np.uint8)
+        padded[:, :n] = raw
+        return padded.view('<u8').ravel().astype(np.uint64)
+
+    def _confirm(self, a: int, b: int) -> Optional[Tuple[bytes, bytes]]:
+        if a != b and self.space.suffix(a) == self.space.suffix(b):
+            self.found_at = time.perf_counter()
+            return self.space.message(a), self.space.message(b)
+        return None
+
+    def _search_batch(self, base: int, count: int) -> Optional[Tuple[bytes, bytes]]:
+        keys = self._keys(self.space.suffix_block(base, count), count)
+        ids = np.arange(base, base + count, dtype=np.uint64)
+
+        # Duplicates inside the batch.
+        uniq, first, counts = np.unique(keys, return_index=True, return_counts=True)
+        for key in uniq[counts > 1]:
+            a, b = ids[keys == key][:2]
+            pair = self._confirm(int(a), int(b))
+            if pair is not None:
+                return pair
+
+        # Keys already seen in earlier batches.
+        for _, lkeys, lids in self.levels:
+            pos = np.searchsorted(lkeys, uniq)
+            inside = pos < lkeys.size
+            hits = np.nonzero(inside)[0][lkeys[pos[inside]] == uniq[inside]]
+            for h in hits:
+                pair = self._confirm(int(lids[pos[h]]), int(ids[first[h]]))
+                if pair is not None:
+                    return pair
+
+        room = self.capacity - self.stored
+        if room > 0:
+            self._push(uniq[:room], ids[first[:room]])
+        return None
+
+    def _push(self, keys, ids):
+        """Add a sorted run at level 0 and merge equal levels like a binary counter."""
+        self.levels.append([0, keys, ids])
+        self.stored += keys.size
+        while len(self.levels) >= 2 and self.levels[-2][0] <= self.levels[-1][0]:
+            (la, ka, ia), (lb, kb, ib) = self.levels[-2:]
+            all_keys = np.concatenate((ka, kb))
+            order = np.argsort(all_keys, kind='stable')      # two sorted runs: close to linear
+            self.levels[-2:] = [[max(la, lb) + 1, all_keys[order], np.concatenate((ia, ib))[order]]]
+
+    def _progress_fields(self) -> dict:
+        return {"unique": self.stored, "levels": len(self.levels)}
+
+    def run(self) -> Optional[Tuple[bytes, bytes]]:
+        self._announce(numpy_batch=f"{self.batch_size:,}", table=f"<= {self.capacity * ENTRY_BYTES / 2**20:.0f} MiB")
+        self.started = time.perf_counter()
+        last_poll = self.started
+        reported = 0
+        try:
+            while True:
+                counter = self.counts[0]
+                base = make_id(0, counter + self.batch_size - 1) - (self.batch_size - 1)
+                pair = self._search_batch(base, self.batch_size)
+                self.counts[0] = counter + self.batch_size
+                if pair is not None:
+                    return pair
+                now = time.perf_counter()
+                if now - last_poll >= 0.1:
+                    last_poll = now
+                    if self.tick and self.tick(self):
+                        return None
+                reported = self._report_progress(reported, **self._progress_fields())
+        except KeyboardInterrupt:
+            self._on_interrupt()
+            sys.exit(1)
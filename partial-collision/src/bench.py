@@ -0,0 +1,111 @@
+"""
+Benchmark sweeps for the collision engines (collision_sha256.py --bench).
+
+Two phases:
+
+- throughput: each engine runs for a fixed duration (or hash count) at each
+  worker count, at a width wide enough that no collision is expected but
+  with the table a search at the real width allocates (the caller's `build`
+  sizes it, see table.search_table_mb). Reports
+  hashes/s overall and per worker, scaling efficiency relative to the
+  smallest worker count, and table memory.
+- time to collision: each engine at the largest worker count solves the real
+  width `repeats` times; reports min / median / mean / max seconds to the
+  collision (stats()["found_s"], without teardown) and hashes.
+
+The human summary goes to stderr; the JSON report goes to stdout (or a file).
+"""
+
+import json
+import statistics
+import sys
+import time
+from typing import Callable, Iterable, Optional
+
+from engine import eprint
+
+
+def budget(seconds: Optional[float], hashes: Optional[int]) -> Callable:
+    """Finder tick that stops the search after `seconds` or `hashes`, whichever first."""
+    def tick(finder) -> bool:
+        if hashes is not None and finder.total_hashes >= hashes:
+            return True
+        return seconds is not None and time.perf_counter() - finder.started >= seconds
+    return tick
+
+
+def _summary(values):
+    return {
+        "min": round(min(values), 4),
+        "median": round(statistics.median(values), 4),
+        "mean": round(statistics.fmean(values), 4),
+        "max": round(max(values), 4),
+    }
+
+
+def throughput(build: Callable, engines: Iterable[str], workers: Iterable[int], width: int,
+               seconds: Optional[float], hashes: Optional[int]) -> list:
+    rows = []
+    for engine in engines:
+        base = None
+        for n in workers:
+            finder = build(engine, width, n)
+            finder.tick = budget(seconds, hashes)
+            finder.run()
+            st = finder.stats()
+            rate, w = st["hashes_per_s"], st["workers"]     # numpy ignores the requested count
+            if base is None:
+                base = (w, rate)
+            st["hashes_per_s_per_worker"] = round(rate / w, 1)
+            st["scaling_efficiency"] = round(rate * base[0] / (base[1] * w), 3) if base[1] else None
+            rows.append(st)
+            eprint(f"  {engine:9} workers={w:<3} {rate:>12,.0f} h/s  "
+                   f"{st['hashes_per_s_per_worker']:>10,.0f} h/s/worker  "
+                   f"eff={st['scaling_efficiency']}  table={(st['table_bytes'] or 0) / 2**20:.1f} MiB")
+    return rows
+
+
+def time_to_collision(build: Callable, engines: Iterable[str], workers: int, width: int,
+                      repeats: int) -> list:
+    rows = []
+    for engine in engines:
+        secs, counts = [], []
+        for _ in range(repeats):
+            finder = build(engine, width, workers)
+            if finder.run() is None:
+                raise RuntimeError("Search stopped without a collision.")
+            st = finder.stats()
+            secs.append(st["found_s"])       # excludes worker teardown
+            counts.append(st["hashes"])
+        row = {"engine": engine, "width": width, "workers": workers, "runs": repeats,
+               "seconds": _summary(secs), "hashes": _summary(counts)}
+        rows.append(row)
+        eprint(f"  {engine:9} workers={workers:<3} median {row['seconds']['median']:.3f}s "
+               f"(min {row['seconds']['min']:.3f}s, max {row['seconds']['max']:.3f}s) "
+               f"median hashes {row['hashes']['median']:,.0f}")
+    return rows
+
+
+def run_bench(build: Callable, engines, workers, bench_width: int, width: int,
+              seconds: Optional[float], hashes: Optional[int], repeats: int) -> dict:
+    """
+    `build(engine, width, workers)` returns a fresh finder with run()/stats()/tick.
+    """
+    workers = sorted(set(max(1, n) for n in workers))
+    eprint(f"Throughput sweep (width={bench_width}B, "
+           f"{'%gs' % seconds if seconds else ''}{' / ' if seconds and hashes else ''}"
+           f"{'%d hashes' % hashes if hashes else ''} per run):")
+    report = {"throughput": throughput(build, engines, workers, bench_width, seconds, hashes)}
+    if repeats > 0:
+        eprint(f"Time to collision (width={width}B, {repeats} runs):")
+        report["time_to_collision"] = time_to_collision(build, engines, workers[-1], width, repeats)
+    return report
+
+
+def write_report(report: dict, path: Optional[str] = None):
+    text = json.dumps(report, indent=2)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
@@ -0,0 +1,142 @@
+"""
+Deterministic candidate messages.
+
+Every candidate is identified by an integer id built from (worker id,
+counter); the message is a pure function of the run prefix (email + run
+salt), a per-run entropy buffer and that id. Tables therefore only keep ids,
+and the two colliding messages are regenerated from their ids at the end.
+
+Tail layout: <0-12 bytes of per-run entropy><5-byte id>. HEADS entropy
+slices of varying length are cut (through a memoryview) from a buffer drawn
+once per run from a PRNG seeded with the run salt, and candidate `cid` uses
+head `cid % HEADS`. Tails therefore vary in length and content, and differ run
+to run, without a syscall or RNG call per hash; every worker rebuilds the same
+heads from the seed, and the id suffix keeps messages distinct.
+
+The digest is pluggable (ALGORITHMS, default sha256); only its last N
+bytes are compared. When the prefix fills at least one hash block, each head
+(prefix + slice) is hashed once and candidates resume from a copy of that
+midstate. For the
+usual short "<email>||<salt>|" prefix the whole message fits in one block, so
+there is nothing to save and hashing head + id directly is cheaper than
+copying a hash object.
+"""
+
+import base64
+import functools
+import hashlib
+import random
+
+WORKER_BITS = 8                      # up to 256 workers
+COUNTER_BITS = 32                    # 2^32 candidates per worker
+TAIL_BYTES = (WORKER_BITS + COUNTER_BITS) // 8
+MAX_ID = (1 << (WORKER_BITS + COUNTER_BITS)) - 2   # tables store id + 1 in 40 bits (see table.py)
+ENTROPY_BYTES = 1 << 16              # per-run random buffer that tail heads are sliced from
+HEADS = 4096                         # distinct tail heads (power of two)
+MAX_EXTRA = 12                       # longest entropy slice in a tail
+_STRIDE = 0x9E3779B1                 # odd multiplier spreading heads over the buffer
+
+
+# Digests the search can collide on (the last N bytes of the digest).
+ALGORITHMS = ("sha256", "sha512_256", "blake2b", "blake2s", "sha3_256", "sha3_512")
+
+
+def hasher(name: str):
+    """hashlib constructor for one of ALGORITHMS (OpenSSL-only ones go through hashlib.new)."""
+    if name not in ALGORITHMS:
+        raise ValueError(f"Unknown hash algorithm {name!r}; choose from {', '.join(ALGORITHMS)}.")
+    fn = getattr(hashlib, name, None)
+    if fn is None:
+        if name not in hashlib.algorithms_available:
+            raise ValueError(f"{name} is not available in this Python/OpenSSL build.")
+        fn = functools.partial(hashlib.new, name)
+    return fn
+
+
+def salt_tag(salt: bytes) -> bytes:
+    """Short printable marker of the run salt that goes into every message."""
+    return base64.urlsafe_b64encode(salt)[:10]
+
+
+def make_prefix(email: bytes, salt: bytes) -> bytes:
+    """
+    Message prefix of every candidate in a run; both inputs *begin with* the
+    root email address. Layout: <email> | "||" | salt_tag | "|" (the candidate
+    tail follows, see CandidateSpace.message).
+    """
+    return email + b'||' + salt_tag(salt) + b'|'
+
+
+def make_id(wid: int, counter: int) -> int:
+    if not 0 <= wid < 1 << WORKER_BITS:
+        raise ValueError(f"worker id must be below {1 << WORKER_BITS}.")
+    cid = (wid << COUNTER_BITS) | counter
+    if not 0 <= counter < 1 << COUNTER_BITS or cid > MAX_ID:
+        raise ValueError("per-worker candidate counter exhausted.")
+    return cid
+
+
+class CandidateSpace:
+    """Maps candidate ids to messages and digest-suffix keys."""
+
+    def __init__(self, prefix: bytes, last_n: int, seed: bytes = b'', algo: str = "sha256"):
+        self.prefix = prefix
+        self.last_n = last_n
+        self.algo = algo
+        self.hash = hasher(algo)
+        if last_n > self.hash().digest_size:
+            raise ValueError(f"{algo} digests are only {self.hash().digest_size} bytes.")
+        entropy = memoryview(random.Random(seed).randbytes(ENTROPY_BYTES))
+        span = ENTROPY_BYTES - MAX_EXTRA
+        self.heads = [prefix + entropy[(i * _STRIDE) % span:][:i % (MAX_EXTRA + 1)] for i in range(HEADS)]
+        self.use_midstate = len(prefix) >= self.hash().block_size
+        self.midstates = [self.hash(h) for h in self.heads] if self.use_midstate else None
+
+    def message(self, cid: int) -> bytes:
+        # Layout: <email> || salt_tag | <entropy slice><worker id><counter>
+        return self.heads[cid & (HEADS - 1)] + cid.to_bytes(TAIL_BYTES, 'big')
+
+    def suffix(self, cid: int) -> bytes:
+        return self.hash(self.message(cid)).digest()[-self.last_n:]
+
+    def suffixes(self, first: int, count: int) -> list:
+        """[(cid, digest suffix)] for ids first .. first + count - 1 (the worker hot loop)."""
+        mask = HEADS - 1
+        neg_n = -self.last_n
+        out = []
+        append = out.append
+        if self.use_midstate:
+            states = self.midstates
+            for cid in range(first, first + count):
+                h = states[cid & mask].copy()
+                h.update(cid.to_bytes(TAIL_BYTES, 'big'))
+                append((cid, h.digest()[neg_n:]))
+        else:
+            heads = self.heads
+            digest = self.hash
+            for cid in range(first, first + count):
+                append((cid, digest(heads[cid & mask] + cid.to_bytes(TAIL_BYTES, 'big')).digest()[neg_n:]))
+        return out
+
+    def suffix_block(self, first: int, count: int) -> bytes:
+        """Digest suffixes of ids first .. first + count - 1, concatenated (N bytes each)."""
+        mask = HEADS - 1
+        neg_n = -self.last_n
+        if self.use_midstate:
+            states = self.midstates
+            parts = []
+            append = parts.append
+            for cid in range(first, first + count):
+                h = states[cid & mask].copy()
+                h.update(cid.to_bytes(TAIL_BYTES, 'big'))
+                append(h.digest()[neg_n:])
+            return b"".join(parts)
+        heads = self.heads
+        digest = self.hash
+        return b"".join([digest(heads[cid & mask] + cid.to_bytes(TAIL_BYTES, 'big')).digest()[neg_n:]
+                         for cid in range(first, first + count)])
+
+    @staticmethod
+    def key(suffix: bytes) -> int:
+        """Table key: the low 64 bits of the digest suffix."""
+        return int.from_bytes(suffix[-8:], 'little')
@@ -16,108 +16,189 @@ Recommended usage on commodity hardware:
     python3 collision_sha256.py --email aat0034@auburn.edu --threads 4
 
 Notes:
-- hashlib (C-accelerated) releases the GIL for sha256 updates, so Python threads can help here.
+- Workers hash in batches into thread-local lists and publish them to a sharded table, so threads
+  only synchronize once per shard per batch (no global lock per hash).
+- hashlib only releases the GIL for large buffers; these ~50-byte messages do not, so on a standard
+  (GIL) CPython build thread scaling is limited by the interpreter, not by table contention.
+- Candidates are regenerable from (run salt, worker id, counter), so the tables store one packed
+  64-bit word per entry (see candidates.py / table.py) instead of the full message.
+- --processes N runs N worker processes that share one table in shared memory instead
+  (see shm_engine.py); this is the engine that scales across cores.
+- --rho iterates SHA-256 over N-byte suffixes and keeps only distinguished points (see rho.py),
+  so memory stays small and 6-8 byte widths become feasible.
+- --spill-dir DIR writes sorted (suffix, candidate id) runs to disk and merges them, checkpointing
+  after every run; --resume continues an interrupted search (see spill.py).
+- --numpy hashes in large batches and finds duplicates with vectorized sort / searchsorted / unique
+  (optional dependency; see batch_np.py).
+- --pairs M / --kway K keep searching the same table after the first hit and stream M records of
+  K messages sharing one suffix, one line each: COLLISION <n> -- <suffix hex> -- <b64> -- <b64> ...
+  The two-line output above stays the default.
+- --algo picks the digest (sha256, sha512_256, blake2b, blake2s, sha3_256, sha3_512); the default
+  stays SHA-256, which is what the Makefile verifies.
+- --autotune briefly measures thread / process / numpy configurations on this machine, picks the
+  fastest and caches the choice (see autotune.py); --retune measures again.
+- --metrics-file appends JSON progress records; --bench sweeps engines and worker counts and
+  prints a JSON report (see telemetry.py / bench.py) instead of the two-line output.
 - Trailing-byte width is configurable via --bytes, but the assignment specifies 4 bytes.
 """
 
 import argparse
 import base64
-import hashlib
 import os
-import queue
-import random
 import signal
 import sys
 import threading
 import time
 from typing import Optional, Tuple
 
-def eprint(*args, **kwargs):
-    print(*args, file=sys.stderr, **kwargs)
-
-class CollisionFinder:
-    def __init__(self, email: bytes, last_n: int = 4, threads: int = 4, progress_every: int = 200_000):
-        if b'@auburn.edu' not in email:
-            raise ValueError("Email must be an Auburn root email (contain '@auburn.edu').")
-        if last_n < 1 or last_n > 32:
-            raise ValueError("last_n must be between 1 and 32.")
-        self.email = email
-        self.last_n = last_n
+from candidates import ALGORITHMS, CandidateSpace, hasher, make_id
+from engine import BaseCollisionFinder, eprint
+from table import CompactTable, birthday_slots, search_table_mb
+from telemetry import MetricsWriter, engine_stats
+
+class CollisionFinder(BaseCollisionFinder):
+    """
+    Threaded birthday search.
+
+    Workers hash `batch_size` candidates at a time into thread-local lists and
+    only then publish them to a sharded table (one CompactTable + lock per shard), so
+    a lock is taken once per shard per batch instead of once per hash. Each
+    thread counts its own hashes in its own slot of `self.counts`; the main
+    thread aggregates them for progress reporting.
+    """
+
+    def __init__(self, email: bytes, last_n: int = 4, threads: int = 4, progress_every: int = 200_000,
+                 batch_size: int = 4096, shards: int = 64, table_mb: int = 512,
+                 groups: int = 1, kway: int = 2, on_group=None, algo: str = "sha256"):
+        super().__init__(email, last_n, progress_every, algo)
         self.threads = max(1, threads)
-        self.progress_every = progress_every
+        self.batch_size = max(1, batch_size)
+        # Multi-collision mode: keep searching until `groups` sets of `kway` messages sharing a
+        # suffix were passed to on_group(n, messages). The default (1, 2) is the single pair.
+        self.groups = max(1, groups)
+        self.kway = max(2, kway)
+        self.on_group = on_group
 
-        # Non-deterministic salt unique per run to guarantee different outputs each execution.
-        self.run_salt = os.urandom(16)
-        # Short marker for the input layout; also ensures uniqueness across runs
-        self.salt_tag = base64.urlsafe_b64encode(self.run_salt)[:10]
+        self.space = CandidateSpace(self._prefix(), last_n, self.run_salt, algo)
 
-        # Shared state
+        # Shared state: one compact table per shard (power-of-two shard count), each with its own lock.
         self.stop_evt = threading.Event()
-        self.lock = threading.Lock()
-        self.map = {}  # last_n_bytes -> first_input_bytes
-        self.total_hashes = 0
+        self.found_lock = threading.Lock()
+        self.shard_bits = max(1, shards).bit_length() - 1
+        slots = birthday_slots(last_n, table_mb * 1024 * 1024, k=self.kway, groups=self.groups)
+        self.shards = [CompactTable(max(64, slots >> self.shard_bits)) for _ in range(1 << self.shard_bits)]
+        self.shard_locks = [threading.Lock() for _ in self.shards]
+        self.counts = [0] * self.threads                     # hashes per worker, written only by that worker
         self.found_pair: Optional[Tuple[bytes, bytes]] = None
+        self.matches = {}                                    # colliding suffix -> candidate ids (under found_lock)
+        self.emitted = 0
+
+    def stats(self) -> dict:
+        return engine_stats("threads", self.started, self.counts, self.last_n,
+                            table_bytes=self.table_bytes, entries=self.unique, found_at=self.found_at)
 
-    def _prefix(self) -> bytes:
-        # Ensure both inputs *begin with* the root email address
-        # Layout: <email> | "||" | salt_tag | "|" | (variable random tail)
-        return self.email + b'||' + self.salt_tag + b'|'
+    @property
+    def unique(self) -> int:
+        return sum(shard.size for shard in self.shards)
+
+    @property
+    def table_bytes(self) -> int:
+        return sum(shard.nbytes for shard in self.shards)
 
     def _worker(self, tid: int):
-        prefix = self._prefix()
-        rng = random.Random(os.urandom(16))
-        local_count = 0
+        suffixes = self.space.suffixes
+        shard_mask = len(self.shards) - 1
+        shard_bits = self.shard_bits
+        counter = 0
         try:
             while not self.stop_evt.is_set():
-                # Variable-length random tail (to vary message sizes and content)
-                # Keep tails reasonably small to keep hashing fast
-                tail_len = rng.randint(6, 18)
-                tail = os.urandom(tail_len)
-
-                msg = prefix + tail
-                digest = hashlib.sha256(msg).digest()
-                key = digest[-self.last_n:]
-
-                with self.lock:
-                    self.total_hashes += 1
-                    if key in self.map:
-                        other = self.map[key]
-                        if other != msg:
-                            self.found_pair = (other, msg)
-                            self.stop_evt.set()
-                            return
-                    else:
-                        self.map[key] = msg
-
-                    local_count += 1
-                    if self.total_hashes % self.progress_every == 0:
-                        # Progress log to stderr only
-                        eprint(f"[{time.strftime('%H:%M:%S')}] hashes={self.total_hashes:,} "
-                               f"unique={len(self.map):,} threads={self.threads} "
-                               f"width={self.last_n}B keyspace≈{256**self.last_n:,}")
+                # Hash a whole batch without touching shared state.
+                base = make_id(tid, counter + self.batch_size - 1) - (self.batch_size - 1)
+                by_shard = {}
+                for cid, suffix in suffixes(base, self.batch_size):
+                    key = int.from_bytes(suffix[-8:], 'little')
+                    by_shard.setdefault(key & shard_mask, []).append((key >> shard_bits, cid, suffix))
+                counter += self.batch_size
+
+                self.counts[tid] += self.batch_size
+                if self._publish(by_shard):
+                    return
         except Exception as ex:
             # Any unexpected error should stop the search and surface non-zero exit
             self.stop_evt.set()
             raise
 
-    def run(self) -> Tuple[bytes, bytes]:
-        eprint(f"Starting search: trailing={self.last_n} bytes, threads={self.threads}")
-        eprint(f"Run salt tag: {self.salt_tag.decode('ascii', errors='ignore')}")
+    def _publish(self, by_shard: dict) -> bool:
+        """Insert a batch shard by shard; returns True once the search is complete."""
+        suffix_of = self.space.suffix
+        for idx, items in by_shard.items():
+            shard = self.shards[idx]
+            with self.shard_locks[idx]:
+                for key, cid, suffix in items:
+                    # Tags are partial; confirm by regenerating the stored candidate.
+                    other = shard.insert(key, cid, lambda o: suffix_of(o) == suffix)
+                    if other is not None and self._record(suffix, other, cid):
+                        self.stop_evt.set()
+                        return True
+        return False
+
+    def _record(self, suffix: bytes, first: int, cid: int) -> bool:
+        """
+        Note that `cid` collides with the table entry `first`. The table keeps the
+        first candidate per suffix, so every later match extends the same group.
+        Returns True once enough groups were found.
+        """
+        message = self.space.message
+        with self.found_lock:
+            if self.emitted >= self.groups:
+                return True
+            if self.found_pair is None:
+                self.found_at = time.perf_counter()
+                self.found_pair = (message(first), message(cid))
+            if self.kway == 2:
+                group = [first, cid]                     # every extra match is a new pair
+            else:
+                group = self.matches.setdefault(suffix, [first])
+                group.append(cid)
+                if len(group) != self.kway:
+                    return False
+            self.emitted += 1
+            if self.on_group is not None:
+                self.on_group(self.emitted, [message(c) for c in group])
+            return self.emitted >= self.groups
+
+    def _progress_fields(self) -> dict:
+        return {"unique": self.unique, "threads": self.threads}
+
+    def run(self) -> Optional[Tuple[bytes, bytes]]:
+        self._announce(threads=self.threads, table=f"{self.table_bytes / 2**20:.1f} MiB")
         threads = [threading.Thread(target=self._worker, args=(i,), daemon=True) for i in range(self.threads)]
+        self.started = time.perf_counter()
         for t in threads: t.start()
 
         # Wait loop
+        reported = 0
+        stopped = False
         try:
             while not self.stop_evt.is_set():
                 time.sleep(0.1)
+                # Progress log to stderr only
+                reported = self._report_progress(reported, **self._progress_fields())
+                if self.tick and self.tick(self):
+                    stopped = True
+                    self.stop_evt.set()
+                if not any(t.is_alive() for t in threads):
+                    break
         except KeyboardInterrupt:
-            eprint("Interrupted by user.")
+            self._on_interrupt()
             self.stop_evt.set()
             for t in threads: t.join(timeout=0.2)
             sys.exit(1)
 
         for t in threads: t.join()
 
+        if not self.found_pair and stopped:
+            return None
         if not self.found_pair:
             raise RuntimeError("Stopped without finding a collision (unexpected).")
         return self.found_pair
@@ -128,14 +209,138 @@ def b64(b: bytes) -> str:
 def main(argv=None):
     parser = argparse.ArgumentParser(description="Find a partial SHA-256 collision where both inputs begin with a given Auburn email.")
     parser.add_argument("--email", required=True, help="Root Auburn email address (e.g., aat0034@auburn.edu)")
-    parser.add_argument("--bytes", type=int, default=4, help="Number of trailing bytes of the SHA-256 digest to collide (default: 4)")
-    parser.add_argument("--threads", type=int, default=max(1, os.cpu_count() or 1), help="Number of worker threads (default: CPU count)")
+    parser.add_argument("--bytes", type=int, default=4, help="Number of trailing bytes of the digest to collide (default: 4)")
+    parser.add_argument("--algo", default="sha256", choices=ALGORITHMS, help="Hash algorithm whose trailing bytes must match (default: sha256)")
+    parser.add_argument("--threads", type=int, default=None, help="Number of worker threads (default: CPU count)")
     parser.add_argument("--progress-every", type=int, default=200_000, help="Log progress to stderr every N total hashes")
+    parser.add_argument("--batch-size", type=int, default=None, help="Hashes per worker batch between table publishes (default: 4096; 65536 with --numpy)")
+    parser.add_argument("--processes", type=int, default=0, help="Use N worker processes with a shared-memory table instead of threads (default: 0 = threads)")
+    parser.add_argument("--numpy", action="store_true", help="Detect duplicates with vectorized NumPy batches (requires numpy; see batch_np.py)")
+    parser.add_argument("--pairs", type=int, default=None, help="Keep searching the same table and stream this many collision records (threads engine)")
+    parser.add_argument("--kway", type=int, default=None, help="Each streamed record holds K messages sharing one suffix (default: 2)")
+    parser.add_argument("--rho", action="store_true", help="Use the memoryless distinguished-point search (for wide --bytes)")
+    parser.add_argument("--dp-bits", type=int, default=None, help="Distinguished-point bits for --rho (default: 4*bytes-14)")
+    parser.add_argument("--table-mb", type=int, default=512, help="Upper bound on the collision table size in MiB (default: 512)")
+    parser.add_argument("--spill-dir", help="Keep the table on disk as sorted run files in this directory (checkpointed; see spill.py)")
+    parser.add_argument("--resume", action="store_true", help="Continue the search checkpointed in --spill-dir")
+    parser.add_argument("--run-records", type=int, default=1 << 18, help="Records per spill run for --spill-dir (default: 262144)")
+    parser.add_argument("--metrics-file", help="Append periodic JSON metrics (one object per line) to this file")
+    parser.add_argument("--metrics-every", type=float, default=1.0, help="Seconds between --metrics-file records (default: 1)")
+    parser.add_argument("--autotune", action="store_true", help="Use the fastest engine / workers / batch size measured on this machine (cached)")
+    parser.add_argument("--retune", action="store_true", help="With --autotune: measure again instead of using the cached choice")
+    parser.add_argument("--autotune-seconds", type=float, default=0.5, help="Measurement time per configuration for --autotune (default: 0.5)")
+    parser.add_argument("--autotune-cache", default=None, help="Autotune cache file (default: $XDG_CACHE_HOME/partial-collision/autotune.json)")
+    parser.add_argument("--bench", action="store_true", help="Run a throughput / time-to-collision sweep and print a JSON report instead of searching once")
+    parser.add_argument("--bench-engines", default="threads,processes", help="Comma-separated engines to sweep: threads, processes, rho, numpy (default: threads,processes)")
+    parser.add_argument("--bench-workers", default="1,2,4", help="Comma-separated worker counts to sweep (default: 1,2,4)")
+    parser.add_argument("--bench-seconds", type=float, default=3.0, help="Duration of each throughput run (default: 3)")
+    parser.add_argument("--bench-hashes", type=int, default=None, help="Stop each throughput run after this many hashes instead")
+    parser.add_argument("--bench-width", type=int, default=8, help="Width in bytes used for throughput runs, wide enough not to collide (default: 8)")
+    parser.add_argument("--bench-repeats", type=int, default=3, help="Time-to-collision runs per engine at --bytes (default: 3; 0 skips)")
+    parser.add_argument("--bench-report", help="Write the bench JSON report here instead of stdout")
     args = parser.parse_args(argv)
 
     email_bytes = args.email.encode("utf-8")
-    finder = CollisionFinder(email=email_bytes, last_n=args.bytes, threads=args.threads, progress_every=args.progress_every)
-    m1, m2 = finder.run()
+    explicit_workers = args.threads is not None or args.processes > 0 or args.batch_size is not None
+    if args.threads is None:
+        args.threads = max(1, os.cpu_count() or 1)
+    streaming = args.pairs is not None or args.kway is not None
+    if streaming and (args.spill_dir or args.numpy or args.rho or args.processes > 0 or args.bench):
+        parser.error("--pairs/--kway are supported by the threads engine only")
+    if (args.pairs is not None and args.pairs < 1) or (args.kway is not None and args.kway < 2):
+        parser.error("--pairs must be >= 1 and --kway >= 2")
+    width = args.bytes
+
+    def emit_record(n, messages):
+        # Multi-collision output: one line per group, written as soon as it is found.
+        #   COLLISION <n> -- <suffix hex> -- <BASE64 input> -- <BASE64 input> [-- ...]
+        suffix = hasher(args.algo)(messages[0]).digest()[-width:].hex()
+        sys.stdout.write(f"COLLISION {n} -- {suffix} -- " + " -- ".join(b64(m) for m in messages) + "\n")
+        sys.stdout.flush()
+
+    def build_finder(engine: str, last_n: int, workers: int, batch_size: Optional[int] = None,
+                     table_mb: Optional[int] = None):
+        batch_size = batch_size or args.batch_size
+        table_mb = table_mb or args.table_mb
+        if engine == "spill":
+            from spill import SpillCollisionFinder
+            return SpillCollisionFinder(email=email_bytes, spill_dir=args.spill_dir, last_n=last_n,
+                                        processes=workers, progress_every=args.progress_every,
+                                        run_records=args.run_records, resume=args.resume, algo=args.algo)
+        if engine == "numpy":
+            from batch_np import NumpyCollisionFinder
+            return NumpyCollisionFinder(email=email_bytes, last_n=last_n, progress_every=args.progress_every,
+                                        batch_size=batch_size or 1 << 16, table_mb=table_mb, algo=args.algo)
+        if engine == "rho":
+            from rho import RhoCollisionFinder
+            return RhoCollisionFinder(email=email_bytes, last_n=last_n, processes=workers,
+                                      progress_every=args.progress_every, dp_bits=args.dp_bits, algo=args.algo)
+        if engine == "processes":
+            from shm_engine import ProcessCollisionFinder
+            return ProcessCollisionFinder(email=email_bytes, last_n=last_n, processes=workers,
+                                          progress_every=args.progress_every, table_mb=table_mb, algo=args.algo)
+        if engine == "threads":
+            return CollisionFinder(email=email_bytes, last_n=last_n, threads=workers,
+                                   progress_every=args.progress_every, batch_size=batch_size or 4096,
+                                   table_mb=table_mb, groups=args.pairs or 1, kway=args.kway or 2,
+                                   on_group=emit_record if streaming else None, algo=args.algo)
+        raise ValueError(f"Unknown engine: {engine}")
+
+    if args.bench:
+        from bench import run_bench, write_report
+        # Throughput runs at --bench-width but with the table a --bytes search allocates.
+        bench_mb = search_table_mb(args.bytes, args.table_mb)
+        report = run_bench(lambda e, w, n: build_finder(e, w, n, table_mb=bench_mb), args.bench_engines.split(","),
+                           [int(n) for n in args.bench_workers.split(",")],
+                           args.bench_width, args.bytes, args.bench_seconds if args.bench_hashes is None else None,
+                           args.bench_hashes, args.bench_repeats)
+        write_report(report, args.bench_report)
+        return 0
+
+    if args.resume and not args.spill_dir:
+        parser.error("--resume requires --spill-dir")
+    if args.autotune and (args.spill_dir or args.numpy or args.rho or streaming):
+        parser.error("--autotune picks among the in-memory engines; drop --spill-dir/--numpy/--rho/--pairs/--kway")
+    if args.autotune and explicit_workers:
+        parser.error("--autotune picks the engine, workers and batch size; drop --threads/--processes/--batch-size")
+    if args.autotune:
+        from autotune import autotune
+        from batch_np import np
+        # Measure with the table the real search would allocate, so cache behaviour matches.
+        tune_mb = search_table_mb(args.bytes, args.table_mb)
+        best = autotune(lambda e, w, n, b: build_finder(e, w, n, b, table_mb=tune_mb), args.algo,
+                        have_numpy=np is not None, width=args.bytes, table_mb=tune_mb,
+                        seconds=args.autotune_seconds, path=args.autotune_cache, retune=args.retune)
+        finder = build_finder(best["engine"], args.bytes, best["workers"], best["batch_size"])
+    elif args.spill_dir:
+        try:
+            finder = build_finder("spill", args.bytes, args.processes or 1)
+        except ValueError as e:
+            parser.error(str(e))
+    elif args.numpy:
+        try:
+            finder = build_finder("numpy", args.bytes, 1)
+        except RuntimeError as e:
+            parser.error(str(e))
+    elif args.rho:
+        finder = build_finder("rho", args.bytes, args.processes or args.threads)
+    elif args.processes > 0:
+        finder = build_finder("processes", args.bytes, args.processes)
+    else:
+        finder = build_finder("threads", args.bytes, args.threads)
+
+    metrics = MetricsWriter(args.metrics_file, args.metrics_every) if args.metrics_file else None
+    if metrics:
+        finder.tick = metrics.tick
+    pair = None
+    try:
+        pair = finder.run()
+    finally:
+        if metrics:
+            metrics.close(finder, found=pair is not None)
+    if streaming:
+        return 0
+    m1, m2 = pair
 
     # OUTPUT CONTRACT: exactly two lines to stdout, each prefixed and Base64 encoded (Linux newlines)
     sys.stdout.write(f"INPUT 1 -- {b64(m1)}\n")
@@ -0,0 +1,130 @@
+"""
+Scaffolding shared by the collision engines.
+
+Every engine (threads in collision_sha256.py, shm_engine, rho, spill,
+batch_np) validates the email and width the same way, draws a fresh run
+salt, builds the same message prefix, prints the same start and progress
+lines to stderr and exposes the same surface: run(), stats(), tick, started
+and total_hashes. The process-based engines also share the start-method
+choice, the parent's polling loop and the worker teardown.
+"""
+
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from typing import Callable, Optional, Tuple
+
+from candidates import hasher, make_prefix, salt_tag
+
+
+def eprint(*args, **kwargs):
+    print(*args, file=sys.stderr, **kwargs)
+
+
+def mp_context():
+    """fork shares memory with the workers directly; spawn is the fallback where fork is missing."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+
+def stop_workers(procs, stop_evt, q=None):
+    """Ask the workers to stop, reap them (terminating stragglers) and close their queue."""
+    stop_evt.set()
+    for p in procs:
+        p.join(timeout=1.0)
+        if p.is_alive():
+            p.terminate()
+    if q is not None:
+        q.cancel_join_thread()
+        q.close()
+
+
+class BaseCollisionFinder:
+    """
+    Common state of a search: email, width, digest, run salt and the tick
+    hook. Subclasses implement run() and stats().
+    """
+
+    def __init__(self, email: bytes, last_n: int, progress_every: int = 200_000, algo: str = "sha256"):
+        if b'@auburn.edu' not in email:
+            raise ValueError("Email must be an Auburn root email (contain '@auburn.edu').")
+        self.hash = hasher(algo)    # fail fast on an unknown / unavailable algorithm
+        if not 1 <= last_n <= self.hash().digest_size:
+            raise ValueError(f"last_n must be between 1 and {self.hash().digest_size} for {algo}.")
+        self.email = email
+        self.last_n = last_n
+        self.progress_every = progress_every
+        self.algo = algo
+        # Non-deterministic salt unique per run to guarantee different outputs each execution.
+        self.run_salt = os.urandom(16)
+        self.counts = None          # hashes per worker
+        self.tick = None            # stop hook, see the tick protocol in telemetry.py
+        self.started = None
+        self.found_at = None        # perf_counter() when run() found its result
+
+    @property
+    def salt_tag(self) -> bytes:
+        return salt_tag(self.run_salt)
+
+    def _prefix(self) -> bytes:
+        return make_prefix(self.email, self.run_salt)
+
+    @property
+    def total_hashes(self) -> int:
+        return sum(self.counts) if self.counts is not None else 0
+
+    def _announce(self, search: str = "search", **details):
+        eprint(f"Starting {search}: trailing={self.last_n} bytes"
+               + "".join(f", {k}={v}" for k, v in details.items()))
+        eprint(f"Run salt tag: {self.salt_tag.decode('ascii', errors='ignore')}")
+
+    def run(self) -> Optional[Tuple[bytes, bytes]]:
+        """Returns the colliding pair, or None if `tick` stopped the search first."""
+        raise NotImplementedError
+
+    def _progress_fields(self) -> dict:
+        """Engine-specific counters for the progress line."""
+        return {}
+
+    def _on_interrupt(self):
+        eprint("Interrupted by user.")
+
+    def _poll(self, procs, q, handle: Callable) -> Optional[Tuple[bytes, bytes]]:
+        """
+        Parent loop of the process engines: poll `tick`, wait up to 0.1 s for a
+        worker message on `q` and pass it to handle(message), which returns the
+        result or None to keep searching; log progress in between. Ctrl-C exits
+        with status 1.
+        """
+        reported = 0
+        try:
+            while True:
+                if self.tick and self.tick(self):
+                    return None
+                try:
+                    message = q.get(timeout=0.1)
+                except queue.Empty:
+                    if not any(p.is_alive() for p in procs):
+                        raise RuntimeError("All workers exited without finding a collision.")
+                else:
+                    result = handle(message)
+                    if result is not None:
+                        if self.found_at is None:
+                            self.found_at = time.perf_counter()
+                        return result
+                reported = self._report_progress(reported, **self._progress_fields())
+        except KeyboardInterrupt:
+            self._on_interrupt()
+            sys.exit(1)
+
+    def _report_progress(self, last_reported: int, **fields) -> int:
+        """Log a progress line to stderr every `progress_every` hashes; returns the new mark."""
+        total = self.total_hashes
+        if self.progress_every and total // self.progress_every > last_reported // self.progress_every:
+            eprint(f"[{time.strftime('%H:%M:%S')}] hashes={total:,} "
+                   + "".join(f"{k}={v:,} " for k, v in fields.items())
+                   + f"width={self.last_n}B keyspace≈{256**self.last_n:,}")
+            return total
+        return last_reported
@@ -0,0 +1,142 @@
+"""
+Memoryless collision search with distinguished points (van Oorschot–Wiener).
+
+The table engines store every hash, so their memory grows with the birthday
+bound (~2^(4N) entries for N trailing bytes) and widths of 6-8 bytes do not
+fit. Here we iterate
+
+    f(x) = H(prefix + x)[-N:]        (x is an N-byte suffix, H = --algo)
+
+so every point of a chain is itself a valid email-prefixed message tail. Each
+worker process walks chains from random starts until it reaches a
+distinguished point (low `dp_bits` bits zero) and reports only
+(point, start, length). The parent keeps those in a small dict; when two
+chains from different starts end at the same point, it re-walks both from
+their starts to the merge and returns the two predecessors, whose messages
+collide on the last N digest bytes.
+
+Memory is ~2^(4N - dp_bits) entries; the extra work is ~2^dp_bits hashes per
+chain for the final walk. Chains longer than 20 * 2^dp_bits are abandoned
+(they are most likely stuck in a cycle).
+"""
+
+import os
+import random
+import time
+from typing import Optional, Tuple
+
+from candidates import hasher
+from engine import BaseCollisionFinder, mp_context, stop_workers
+from telemetry import engine_stats
+
+FLUSH_SECONDS = 0.05       # how often workers send their distinguished points
+MAX_CHAIN_FACTOR = 20
+
+
+def default_dp_bits(last_n: int) -> int:
+    """Keep the distinguished-point table around 2^14 entries."""
+    return max(1, 4 * last_n - 14)
+
+
+def _chain_worker(wid, prefix, last_n, dp_bits, algo, stop_evt, out_q, counts):
+    rng = random.Random(os.urandom(16))
+    digest = hasher(algo)
+    dp_mask = (1 << dp_bits) - 1
+    max_len = MAX_CHAIN_FACTOR << dp_bits
+    steps = 0
+    points = []
+    flushed = time.monotonic()
+    out_q.cancel_join_thread()      # never block exit on points the parent no longer reads
+    try:
+        while not stop_evt.is_set():
+            start = x = rng.randbytes(last_n)
+            for length in range(1, max_len + 1):
+                x = digest(prefix + x).digest()[-last_n:]
+                if int.from_bytes(x, 'little') & dp_mask == 0:
+                    points.append((x, start, length))
+                    break
+                if length & 0xFFF == 0:
+                    counts[wid] = steps + length
+            steps += length
+            counts[wid] = steps
+            now = time.monotonic()
+            if points and now - flushed >= FLUSH_SECONDS:
+                out_q.put(points)
+                points = []
+                flushed = now
+    except KeyboardInterrupt:
+        pass
+
+
+class RhoCollisionFinder(BaseCollisionFinder):
+    """Distinguished-point search: memory grows with the number of chains, not of hashes."""
+
+    def __init__(self, email: bytes, last_n: int = 4, processes: int = 4,
+                 progress_every: int = 200_000, dp_bits: Optional[int] = None, algo: str = "sha256"):
+        super().__init__(email, last_n, progress_every, algo)
+        self.processes = max(1, processes)
+        self.dp_bits = default_dp_bits(last_n) if dp_bits is None else max(0, dp_bits)
+        self.points = {}                    # distinguished point -> (start, length)
+
+    def stats(self) -> dict:
+        return engine_stats("rho", self.started, self.counts or [0] * self.processes, self.last_n,
+                            entries=len(self.points), found_at=self.found_at)
+
+    def _step(self, x: bytes) -> bytes:
+        return self.hash(self._prefix() + x).digest()[-self.last_n:]
+
+    def _walk(self, a: bytes, la: int, b: bytes, lb: int) -> Optional[Tuple[bytes, bytes]]:
+        """
+        Re-walk two chains that end at the same distinguished point. Returns the
+        two distinct points whose images are equal, or None when one start lies
+        on the other chain (the chains merge without a collision).
+        """
+        if la < lb:
+            a, la, b, lb = b, lb, a, la
+        for _ in range(la - lb):
+            a = self._step(a)
+        if a == b:
+            return None
+        while True:
+            fa, fb = self._step(a), self._step(b)
+            if fa == fb:
+                return a, b
+            a, b = fa, fb
+
+    def _add(self, point: bytes, start: bytes, length: int) -> Optional[Tuple[bytes, bytes]]:
+        seen = self.points.setdefault(point, (start, length))
+        if seen[0] == start:
+            return None
+        pair = self._walk(seen[0], seen[1], start, length)
+        if pair is None and length > seen[1]:
+            self.points[point] = (start, length)   # keep the chain that covers more
+        return pair
+
+    def _progress_fields(self) -> dict:
+        return {"points": len(self.points), "processes": self.processes}
+
+    def _handle(self, prefix: bytes, batch) -> Optional[Tuple[bytes, bytes]]:
+        for point, start, length in batch:
+            pair = self._add(point, start, length)
+            if pair is not None:
+                return prefix + pair[0], prefix + pair[1]
+        return None
+
+    def run(self) -> Optional[Tuple[bytes, bytes]]:
+        ctx = mp_context()
+        self._announce("distinguished-point search", processes=self.processes, dp_bits=self.dp_bits)
+
+        prefix = self._prefix()
+        stop_evt = ctx.Event()
+        out_q = ctx.Queue()
+        self.counts = ctx.Array('Q', self.processes, lock=False)
+        procs = [ctx.Process(target=_chain_worker, daemon=True,
+                             args=(i, prefix, self.last_n, self.dp_bits, self.algo, stop_evt, out_q, self.counts))
+                 for i in range(self.processes)]
+        try:
+            self.started = time.perf_counter()
+            for p in procs:
+                p.start()
+            return self._poll(procs, out_q, lambda batch: self._handle(prefix, batch))
+        finally:
+            stop_workers(procs, stop_evt, out_q)
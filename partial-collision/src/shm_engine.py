@@ -0,0 +1,99 @@
+"""
+Multiprocess collision engine backed by a shared-memory hash table.
+
+hashlib keeps the GIL for short (~50 byte) messages, so threads cannot use
+more than one core. Here every worker is a separate process: it generates and
+hashes candidates itself and inserts (digest suffix, candidate id) records into one
+open-addressing table that lives in multiprocessing.shared_memory, visible to
+all workers. The first verified collision is sent back to the parent over a
+queue.
+
+The table is the CompactTable from table.py laid over the shared buffer: one
+packed 64-bit (tag, candidate id) word per slot. Claim semantics are "atomic
+enough" rather than atomic: a slot is written with a single aligned 8-byte
+store, and a reader only trusts a matching slot after regenerating and
+re-hashing the stored candidate. A race between two writers can at worst lose
+one entry (a slightly longer search); it can never report a false collision.
+"""
+
+import time
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+from candidates import CandidateSpace, make_id
+from engine import BaseCollisionFinder, mp_context, stop_workers
+from table import SLOT_BYTES, CompactTable, birthday_slots
+from telemetry import engine_stats
+
+COUNT_EVERY = 1024     # hashes between counter updates / stop checks
+
+
+def _worker(wid, shm, capacity, last_n, prefix, seed, algo, stop_evt, found_q, counts):
+    # 8-byte aligned stores into the 'Q' view are single machine writes, so a
+    # slot is either empty or a complete (tag, id) word.
+    slots = shm.buf.cast('Q')
+    table = CompactTable(capacity, slots)
+    space = CandidateSpace(prefix, last_n, seed, algo)
+    counter = 0
+    try:
+        while not stop_evt.is_set():
+            base = make_id(wid, counter + COUNT_EVERY - 1) - (COUNT_EVERY - 1)
+            for cid, suffix in space.suffixes(base, COUNT_EVERY):
+                # Re-hash the stored candidate: a tag match alone is not a collision.
+                other = table.insert(int.from_bytes(suffix[-8:], 'little'), cid,
+                                     lambda o: space.suffix(o) == suffix)
+                if other is not None:
+                    found_q.put((space.message(other), space.message(cid)))
+                    stop_evt.set()
+                    break
+            counter += COUNT_EVERY
+            counts[wid] = counter
+    except KeyboardInterrupt:
+        pass
+    finally:
+        del table
+        slots.release()
+
+
+class ProcessCollisionFinder(BaseCollisionFinder):
+    """Birthday search in worker processes that share one table in shared memory."""
+
+    def __init__(self, email: bytes, last_n: int = 4, processes: int = 4,
+                 progress_every: int = 200_000, table_mb: int = 512, algo: str = "sha256"):
+        super().__init__(email, last_n, progress_every, algo)
+        self.processes = max(1, processes)
+        self.capacity = birthday_slots(last_n, table_mb * 1024 * 1024)
+
+    def stats(self) -> dict:
+        return engine_stats("processes", self.started, self.counts or [0] * self.processes, self.last_n,
+                            table_bytes=self.capacity * SLOT_BYTES, found_at=self.found_at)
+
+    def _progress_fields(self) -> dict:
+        return {"processes": self.processes}
+
+    def run(self) -> Optional[Tuple[bytes, bytes]]:
+        ctx = mp_context()
+        size = self.capacity * SLOT_BYTES
+        self._announce(processes=self.processes,
+                       table=f"{self.capacity:,} slots ({size / 2**20:.1f} MiB shared)")
+
+        # New POSIX shared memory is zero-filled, i.e. an empty table. fork
+        # shares the mapping directly; spawn re-attaches by name.
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        stop_evt = ctx.Event()
+        found_q = ctx.Queue()
+        self.counts = ctx.Array('Q', self.processes, lock=False)
+        procs = [ctx.Process(target=_worker, daemon=True,
+                             args=(i, shm, self.capacity, self.last_n, self._prefix(), self.run_salt, self.algo,
+                                   stop_evt, found_q, self.counts))
+                 for i in range(self.processes)]
+        try:
+            self.started = time.perf_counter()
+            for p in procs:
+                p.start()
+            # Workers only send verified pairs.
+            return self._poll(procs, found_q, lambda pair: pair)
+        finally:
+            stop_workers(procs, stop_evt, found_q)
+            shm.close()
+            shm.unlink()
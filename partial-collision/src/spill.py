@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+External-memory collision search: sorted spill runs with checkpoint/resume.
+
+Worker processes hash `run_records` candidates at a time, sort the fixed-size
+records
+
+    <digest suffix: N bytes><candidate id: 5 bytes, big-endian>
+
+and write them to a run file in the spill directory. Duplicates inside a run
+show up as adjacent records. Across runs, the parent merges runs of equal
+level pairwise (a binary counter, like an LSM tree), and equal suffixes meet
+during the streaming merge, so every pair of records is compared once the
+two runs holding them are merged. Memory stays at one run per worker plus
+the merge buffers; disk holds every record. Pairs split across unmerged runs
+are found late, so a search typically hashes up to ~2x what the in-memory
+table needs; that is the price for a table that exceeds RAM.
+
+manifest.json records the run salt (so candidates can be regenerated), the
+runs and their levels, and the next counter of each worker. It is replaced
+atomically after every new run and every merge, so Ctrl-C or a crash loses
+at most the runs in flight; --resume continues from it with the same
+candidate ids.
+
+Spill directories from separate machines can be merged offline:
+
+    python3 spill.py DIR [DIR ...]
+
+prints the usual two INPUT lines if any two records across them collide.
+"""
+
+import base64
+import glob
+import heapq
+import json
+import os
+import sys
+import time
+from typing import Iterator, List, Optional, Tuple
+
+from candidates import TAIL_BYTES, CandidateSpace, make_id, make_prefix
+from engine import BaseCollisionFinder, eprint, mp_context, stop_workers
+from telemetry import engine_stats
+
+MANIFEST = "manifest.json"
+CHUNK_RECORDS = 16384      # hashes between stop checks / records per read
+
+
+def _write_run(path: str, records: List[bytes]):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"".join(records))
+    os.replace(tmp, path)
+
+
+def read_run(path: str, size: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(size * CHUNK_RECORDS)
+            if not chunk:
+                return
+            for i in range(0, len(chunk), size):
+                yield chunk[i:i + size]
+
+
+def _tagged(path: str, size: int, src: int) -> Iterator[Tuple[bytes, int]]:
+    for rec in read_run(path, size):
+        yield rec, src
+
+
+def merge_runs(sources: List[Tuple[str, int]], size: int, key_len: int,
+               out_path: Optional[str] = None) -> Iterator[Tuple[Tuple[bytes, int], Tuple[bytes, int]]]:
+    """
+    Stream a k-way merge of sorted runs given as (path, source index); yields
+    adjacent ((record, src), (record, src)) pairs with equal suffixes. With
+    out_path, the merged run is written there (atomically, once exhausted).
+    """
+    out = open(out_path + ".tmp", "wb") if out_path else None
+    try:
+        prev = None
+        for item in heapq.merge(*(_tagged(p, size, s) for p, s in sources)):
+            if out:
+                out.write(item[0])
+            if prev is not None and prev[0][:key_len] == item[0][:key_len]:
+                yield prev, item
+            prev = item
+        if out:
+            out.close()
+            os.replace(out_path + ".tmp", out_path)
+    finally:
+        if out and not out.closed:
+            out.close()
+            os.remove(out_path + ".tmp")
+
+
+def _spill_worker(wid, counter, prefix, seed, algo, last_n, run_records, spill_dir, stop_evt, done_q, counts):
+    space = CandidateSpace(prefix, last_n, seed, algo)
+    done_q.cancel_join_thread()     # runs the parent no longer reads are regenerated on --resume
+    try:
+        while not stop_evt.is_set():
+            start = counter
+            records = []
+            for first in range(start, start + run_records, CHUNK_RECORDS):
+                if stop_evt.is_set():
+                    return
+                n = min(CHUNK_RECORDS, start + run_records - first)
+                base = make_id(wid, first + n - 1) - (n - 1)
+                records.extend(suffix + cid.to_bytes(TAIL_BYTES, 'big')
+                               for cid, suffix in space.suffixes(base, n))
+                counts[wid] = first + n
+            records.sort()
+            dups = [(a[last_n:], b[last_n:]) for a, b in zip(records, records[1:])
+                    if a[:last_n] == b[:last_n]]
+            name = f"w{wid:03d}-c{start:010d}.run"
+            _write_run(os.path.join(spill_dir, name), records)
+            counter = start + run_records
+            done_q.put((wid, name, counter, run_records, dups))
+    except KeyboardInterrupt:
+        pass
+
+
+class SpillCollisionFinder(BaseCollisionFinder):
+    """Birthday search with the table on disk as sorted, checkpointed runs."""
+
+    def __init__(self, email: bytes, spill_dir: str, last_n: int = 4, processes: int = 1,
+                 progress_every: int = 200_000, run_records: int = 1 << 18, resume: bool = False,
+                 algo: str = "sha256"):
+        super().__init__(email, last_n, progress_every, algo)
+        self.processes = max(1, processes)
+        self.run_records = max(1, run_records)
+        self.spill_dir = spill_dir
+        self.record_size = last_n + TAIL_BYTES
+        os.makedirs(spill_dir, exist_ok=True)
+
+        self.manifest_path = os.path.join(spill_dir, MANIFEST)
+        if os.path.exists(self.manifest_path):
+            if not resume:
+                raise ValueError(f"{spill_dir} already holds a search; pass --resume or use an empty directory.")
+            self._load_manifest()
+        else:
+            if resume:
+                raise ValueError(f"Nothing to resume: {self.manifest_path} does not exist.")
+            self.runs = []                  # [{"name", "level", "records"}]
+            self.next_counter = {}          # worker id -> next counter
+        self.space = CandidateSpace(self._prefix(), last_n, self.run_salt, algo)
+        self.resumed_at = dict(self.next_counter)
+
+    def _load_manifest(self):
+        with open(self.manifest_path, encoding="utf-8") as f:
+            m = json.load(f)
+        algo = m.get("algo", "sha256")
+        if m["email"] != self.email.decode("utf-8") or m["width"] != self.last_n or algo != self.algo:
+            raise ValueError(f"{self.spill_dir} holds a search for {m['email']} / {m['width']} bytes / {algo}.")
+        self.run_salt = bytes.fromhex(m["run_salt"])
+        self.runs = m["runs"]
+        self.next_counter = {int(k): v for k, v in m["next_counter"].items()}
+        # Runs that were in flight when the last process stopped are regenerated.
+        known = {r["name"] for r in self.runs}
+        for path in glob.glob(os.path.join(self.spill_dir, "*.run")) + glob.glob(os.path.join(self.spill_dir, "*.tmp")):
+            if os.path.basename(path) not in known:
+                os.remove(path)
+
+    def _save_manifest(self):
+        m = {
+            "email": self.email.decode("utf-8"),
+            "width": self.last_n,
+            "algo": self.algo,
+            "run_salt": self.run_salt.hex(),
+            "runs": self.runs,
+            "next_counter": {str(k): v for k, v in sorted(self.next_counter.items())},
+            "hashes": sum(self.next_counter.values()),
+        }
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(m, f, indent=1)
+        os.replace(tmp, self.manifest_path)
+
+    @property
+    def total_hashes(self) -> int:
+        """Candidates hashed so far, including earlier sessions (counters resume)."""
+        if self.counts is None:
+            return sum(self.next_counter.values())
+        return sum(self.counts) + sum(v for k, v in self.next_counter.items() if k >= self.processes)
+
+    def _session_counts(self) -> List[int]:
+        if self.counts is None:
+            return [0] * self.processes
+        return [c - self.resumed_at.get(i, 0) for i, c in enumerate(self.counts)]
+
+    @property
+    def disk_records(self) -> int:
+        return sum(r["records"] for r in self.runs)
+
+    def stats(self) -> dict:
+        return engine_stats("spill", self.started, self._session_counts(), self.last_n,
+                            table_bytes=self.disk_records * self.record_size, entries=self.disk_records,
+                            found_at=self.found_at)
+
+    def _confirm(self, cid_a: bytes, cid_b: bytes, suffix: bytes) -> Optional[Tuple[bytes, bytes]]:
+        a, b = int.from_bytes(cid_a, 'big'), int.from_bytes(cid_b, 'big')
+        if a != b and self.space.suffix(a) == suffix == self.space.suffix(b):
+            self.found_at = time.perf_counter()
+            return self.space.message(a), self.space.message(b)
+        return None
+
+    def _compact(self) -> Optional[Tuple[bytes, bytes]]:
+        """
+        Merge the two newest runs until levels strictly decrease from oldest to
+        newest (equal levels merge one level up, like a binary counter; a run
+        left behind by an interrupted merge is folded in as well), checking for
+        equal suffixes along the way.
+        """
+        n = self.last_n
+        while len(self.runs) >= 2 and self.runs[-2]["level"] <= self.runs[-1]["level"]:
+            older, newer = self.runs[-2], self.runs[-1]
+            level = max(older["level"], newer["level"]) + 1
+            name = f"L{level:02d}-{os.urandom(4).hex()}.run"
+            merged = os.path.join(self.spill_dir, name)
+            sources = [(os.path.join(self.spill_dir, r["name"]), 0) for r in (older, newer)]
+            for (ra, _), (rb, _) in merge_runs(sources, self.record_size, n, out_path=merged):
+                pair = self._confirm(ra[n:], rb[n:], ra[:n])
+                if pair is not None:
+                    return pair
+            self.runs[-2:] = [{"name": name, "level": level,
+                               "records": older["records"] + newer["records"]}]
+            self._save_manifest()
+            for r in (older, newer):
+                os.remove(os.path.join(self.spill_dir, r["name"]))
+        return None
+
+    def _progress_fields(self) -> dict:
+        return {"runs": len(self.runs), "on_disk": self.disk_records, "processes": self.processes}
+
+    def _on_interrupt(self):
+        eprint(f"Interrupted by user; {len(self.runs)} runs checkpointed in {self.spill_dir} "
+               f"(rerun with --resume to continue).")
+
+    def _handle(self, message) -> Optional[Tuple[bytes, bytes]]:
+        """Check a finished run's internal duplicates, checkpoint it and compact."""
+        wid, name, counter, records, dups = message
+        for cid_a, cid_b in dups:
+            pair = self._confirm(cid_a, cid_b, self.space.suffix(int.from_bytes(cid_a, 'big')))
+            if pair is not None:
+                return pair
+        self.runs.append({"name": name, "level": 0, "records": records})
+        self.next_counter[wid] = counter
+        self._save_manifest()
+        return self._compact()
+
+    def run(self) -> Optional[Tuple[bytes, bytes]]:
+        ctx = mp_context()
+        self._announce("spill search", processes=self.processes, dir=self.spill_dir,
+                       runs=f"{len(self.runs)} ({self.disk_records:,} records on disk)")
+
+        self.resumed_at = dict(self.next_counter)
+        stop_evt = ctx.Event()
+        done_q = ctx.Queue()
+        self.counts = ctx.Array('Q', [self.next_counter.get(i, 0) for i in range(self.processes)], lock=False)
+        procs = [ctx.Process(target=_spill_worker, daemon=True,
+                             args=(i, self.next_counter.get(i, 0), self._prefix(), self.run_salt, self.algo,
+                                   self.last_n, self.run_records, self.spill_dir, stop_evt, done_q, self.counts))
+                 for i in range(self.processes)]
+        self._save_manifest()
+        try:
+            try:
+                # Finish a merge an earlier session was interrupted in.
+                pair = self._compact()
+            except KeyboardInterrupt:
+                self._on_interrupt()
+                sys.exit(1)
+            if pair is not None:
+                return pair
+            self.started = time.perf_counter()
+            for p in procs:
+                p.start()
+            return self._poll(procs, done_q, self._handle)
+        finally:
+            stop_workers(procs, stop_evt, done_q)
+
+
+def merge_dirs(dirs: List[str]) -> Optional[Tuple[bytes, bytes]]:
+    """Offline k-way merge of every run in several spill directories."""
+    spaces, sources, width, algo = [], [], None, None
+    for src, d in enumerate(dirs):
+        with open(os.path.join(d, MANIFEST), encoding="utf-8") as f:
+            m = json.load(f)
+        if width is not None and (m["width"], m.get("algo", "sha256")) != (width, algo):
+            raise ValueError("All spill directories must use the same --bytes width and --algo.")
+        width, algo = m["width"], m.get("algo", "sha256")
+        salt = bytes.fromhex(m["run_salt"])
+        spaces.append(CandidateSpace(make_prefix(m["email"].encode("utf-8"), salt), width, salt, algo))
+        sources.extend((os.path.join(d, r["name"]), src) for r in m["runs"])
+    if width is None:
+        return None
+    for (ra, sa), (rb, sb) in merge_runs(sources, width + TAIL_BYTES, width):
+        a, b = int.from_bytes(ra[width:], 'big'), int.from_bytes(rb[width:], 'big')
+        ma, mb = spaces[sa].message(a), spaces[sb].message(b)
+        if ma != mb and spaces[sa].suffix(a) == ra[:width] == spaces[sb].suffix(b):
+            return ma, mb
+    return None
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Merge spill directories offline and report a collision.")
+    parser.add_argument("dirs", nargs="+", help="spill directories (each with a manifest.json)")
+    args = parser.parse_args(argv)
+    pair = merge_dirs(args.dirs)
+    if pair is None:
+        eprint("No collision across the given runs.")
+        return 1
+    sys.stdout.write(f"INPUT 1 -- {base64.b64encode(pair[0]).decode('ascii')}\n")
+    sys.stdout.write(f"INPUT 2 -- {base64.b64encode(pair[1]).decode('ascii')}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
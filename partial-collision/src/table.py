@@ -0,0 +1,98 @@
+"""
+Compact collision table shared by the thread and process engines.
+
+Candidates are regenerable (see candidates.py), so the table never stores a
+message: each slot is one 64-bit word packing a short tag of the digest key
+and the candidate id + 1 (0 marks an empty slot). That is 8 bytes per slot
+instead of the ~150 bytes a dict entry with bytes key and bytes message
+costs. The slot array is preallocated from the birthday bound and can live in
+an `array('Q')` or in a shared-memory buffer cast to 'Q'.
+
+A tag match is only a *candidate* collision; the caller confirms it by
+regenerating the stored message and comparing full digest suffixes.
+"""
+
+import math
+from array import array
+from typing import Callable, Optional
+
+ID_BITS = 40                          # candidate id + 1 fits in the low 40 bits
+ID_MASK = (1 << ID_BITS) - 1
+TAG_BITS = 64 - ID_BITS
+TAG_MASK = (1 << TAG_BITS) - 1
+SLOT_BYTES = 8
+PROBE_LIMIT = 64                      # give up inserting after this many occupied slots
+
+
+def expected_entries(last_n: int, k: int = 2, groups: int = 1) -> float:
+    """
+    Rough number of stored candidates before `groups` k-way collisions on N
+    bytes appear: (groups * k! * 2^(8N(k-1)))^(1/k). For k=2, groups=1 this
+    is the birthday bound.
+    """
+    return (groups * math.factorial(k)) ** (1 / k) * 2 ** (8 * last_n * (k - 1) / k)
+
+
+def birthday_slots(last_n: int, max_bytes: int, load: float = 0.5, k: int = 2, groups: int = 1) -> int:
+    """
+    Power-of-two slot count that keeps the expected number of entries before
+    the wanted collisions (see expected_entries) at about `load`, capped by
+    max_bytes. Once the table is full, searches keep probing it but stop
+    inserting.
+    """
+    want = max(1024, int(expected_entries(last_n, k, groups) / load))
+    cap = max(1024, max_bytes // SLOT_BYTES)
+    return 1 << (min(want, cap).bit_length() - 1)
+
+
+def search_table_mb(last_n: int, max_mb: int) -> int:
+    """
+    MiB a search at `last_n` bytes actually allocates under a max_mb cap (at
+    least 1). Benchmarks and autotuning that run at a wider, non-colliding
+    width pass this as the table size so they measure the real table.
+    """
+    return max(1, min(max_mb, (birthday_slots(last_n, max_mb << 20) * SLOT_BYTES) >> 20))
+
+
+class CompactTable:
+    """
+    Open-addressing (linear probing) table of packed (tag, id + 1) words.
+
+    `slots` is any mutable sequence of unsigned 64-bit ints with a power-of-two
+    length; by default a zeroed `array('Q')` of `capacity` entries is created.
+    """
+
+    def __init__(self, capacity: int, slots=None):
+        if capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two.")
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.index_bits = capacity.bit_length() - 1
+        self.slots = slots if slots is not None else array('Q', bytes(SLOT_BYTES * capacity))
+        self.size = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.capacity * SLOT_BYTES
+
+    def insert(self, key: int, cid: int, same: Callable[[int], bool]) -> Optional[int]:
+        """
+        Look up `key`; if an entry with an equal tag exists and `same(other_cid)`
+        confirms it, return other_cid. Otherwise store (key, cid) and return None.
+        """
+        slots = self.slots
+        mask = self.mask
+        idx = key & mask
+        tag = (key >> self.index_bits) & TAG_MASK
+        for _ in range(PROBE_LIMIT):
+            word = slots[idx]
+            if word == 0:
+                slots[idx] = (tag << ID_BITS) | (cid + 1)
+                self.size += 1
+                return None
+            if word >> ID_BITS == tag:
+                other = (word & ID_MASK) - 1
+                if other != cid and same(other):
+                    return other
+            idx = (idx + 1) & mask
+        return None
@@ -0,0 +1,73 @@
+"""
+Structured metrics for the collision engines.
+
+Every engine exposes stats() built with engine_stats(), so the same fields
+are available for the threaded, multiprocess and distinguished-point
+searches. MetricsWriter appends one JSON object per line to a file at a
+fixed interval while a search runs (hook it up as the finder's `tick`), and a
+final record when it ends.
+
+Tick protocol: every finder has a `tick` attribute, None by default. When
+set, it is called as tick(finder) -> bool from the thread running
+finder.run(), about ten times per second; returning True stops the search
+and run() returns None. finder.started (time.perf_counter() at the start),
+finder.total_hashes and finder.stats() are valid inside the callback.
+
+stats()["found_s"] is the time from the start to the moment the engine found
+its result, recorded inside run() before the workers are torn down;
+"elapsed_s" is measured when stats() is called, so after run() it also
+covers the teardown.
+"""
+
+import json
+import time
+from typing import Optional, Sequence
+
+
+def engine_stats(engine: str, started: Optional[float], per_worker: Sequence[int], last_n: int,
+                 table_bytes: Optional[int] = None, entries: Optional[int] = None,
+                 found_at: Optional[float] = None) -> dict:
+    elapsed = time.perf_counter() - started if started is not None else 0.0
+    found = found_at - started if started is not None and found_at is not None else None
+    hashes = sum(per_worker)
+    return {
+        "engine": engine,
+        "width": last_n,
+        "workers": len(per_worker),
+        "elapsed_s": round(elapsed, 3),
+        "found_s": round(found, 3) if found is not None else None,
+        "hashes": hashes,
+        "hashes_per_s": round(hashes / elapsed, 1) if elapsed > 0 else 0.0,
+        "per_worker": list(per_worker),
+        "table_bytes": table_bytes,
+        "entries": entries,
+    }
+
+
+class MetricsWriter:
+    """Append finder.stats() as JSON lines every `every` seconds."""
+
+    def __init__(self, path: str, every: float = 1.0):
+        self.path = path
+        self.every = every
+        self.last = None
+        self.fp = open(path, "a", encoding="utf-8")
+
+    def _write(self, finder, event: str):
+        record = {"ts": round(time.time(), 3), "event": event}
+        record.update(finder.stats())
+        self.fp.write(json.dumps(record) + "\n")
+        self.fp.flush()
+
+    def tick(self, finder) -> bool:
+        """Finder tick hook; never asks the search to stop."""
+        now = time.monotonic()
+        if self.last is None or now - self.last >= self.every:
+            self.last = now
+            self._write(finder, "progress")
+        return False
+
+    def close(self, finder=None, found: bool = False):
+        if finder is not None:
+            self._write(finder, "found" if found else "stopped")
+        self.fp.close()
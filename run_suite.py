@@ -1,5 +1,17 @@
 #!/usr/bin/env python3
-import os, subprocess, sys, glob
+"""
+Local harness for spec-testcases/.
+
+By default every case runs in-process: main.py is imported once and main()
+is called per case with sys.argv / stdout / stderr swapped, so the suite no
+longer pays for make + interpreter startup on every file. --subprocess runs
+the original end-to-end path (make -s run FILE=...) instead. Pass/fail rules
+are the same in both modes:
+
+  valid:   exit 0, empty stderr, stdout byte-identical to the .output file
+  invalid: non-zero exit, empty stdout, stderr starting with 'ERROR -- '
+"""
+import argparse, glob, io, os, subprocess, sys, time, traceback
 
 PY = os.environ.get("PY", sys.executable)   # override with PY=... if needed
 OK = True
@@ -7,7 +19,7 @@ OK = True
 def fwd(p: str) -> str:
     return p.replace("\\", "/")
 
-def run_one(input_path, expected_path=None):
+def run_subprocess(input_path):
     env = dict(os.environ)
     env["PY"] = PY
 
@@ -21,47 +33,112 @@ def run_one(input_path, expected_path=None):
         text=False,
         env=env,
     )
+    return p.stdout, p.stderr, p.returncode
 
-    out, err, code = p.stdout, p.stderr, p.returncode
-    name = os.path.relpath(input_path)
+_MAIN = None
 
-    if expected_path:
-        with open(expected_path, "rb") as f:
-            exp = f.read()
+def load_main():
+    """Import main.py once for the whole suite."""
+    global _MAIN
+    if _MAIN is None:
+        import main as _main
+        _MAIN = _main
+    return _MAIN
+
+def run_inprocess(input_path):
+    """Call main.main() on one file; returns (stdout bytes, stderr bytes, exit code)."""
+    load_main()
+
+    out_raw, err_raw = io.BytesIO(), io.BytesIO()
+    out = io.TextIOWrapper(out_raw, encoding="utf-8", newline="\n")
+    err = io.TextIOWrapper(err_raw, encoding="utf-8", newline="\n")
+    saved = sys.argv, sys.stdout, sys.stderr
+    sys.argv, sys.stdout, sys.stderr = ["main.py", input_path], out, err
+    try:
+        _MAIN.main()
+        code = 0
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            # sys.exit("msg") prints msg and exits 1
+            err.write(f"{e.code}\n")
+            code = 1
+    except BaseException:
+        # An uncaught exception is what the interpreter would exit 1 on.
+        traceback.print_exc(file=err)
+        code = 1
+    finally:
+        out.flush()
+        err.flush()
+        sys.argv, sys.stdout, sys.stderr = saved
+    return out_raw.getvalue(), err_raw.getvalue(), code
+
+def check_result(out, err, code, exp=None):
+    """Apply the pass/fail rules; exp is the expected stdout (None = invalid case).
+    Returns (ok, detail lines)."""
+    detail = []
+    if exp is not None:
         if code == 0 and err == b"" and out == exp:
-            print(f"OK -- {name}")
-            return True
-        print(f"FAIL -- {name}")
-        print(f"  exit={code}")
+            return True, detail
+        detail.append(f"exit={code}")
         if err:
-            print("  stderr:", err.decode("utf-8", "replace").rstrip())
+            detail.append("stderr: " + err.decode("utf-8", "replace").rstrip())
         lim = min(len(out), len(exp))
         for i in range(lim):
             if out[i] != exp[i]:
-                print(f"  first byte diff at {i}: got {out[i]:#04x}, exp {exp[i]:#04x}")
+                detail.append(f"first byte diff at {i}: got {out[i]:#04x}, exp {exp[i]:#04x}")
                 break
         if len(out) != len(exp):
-            print(f"  length: got {len(out)}, exp {len(exp)}")
-        return False
-    else:
-        ok = (code != 0) and out == b"" and err.startswith(b"ERROR -- ")
-        if ok:
-            print(f"OK -- {name}")
-        else:
-            print(f"FAIL -- {name}")
-            print(f"  exit={code}")
-            print(f"  stdout={out!r}")
-            print(f"  stderr={err!r}")
-        return ok
+            detail.append(f"length: got {len(out)}, exp {len(exp)}")
+        return False, detail
+    ok = (code != 0) and out == b"" and err.startswith(b"ERROR -- ")
+    if not ok:
+        detail.append(f"exit={code}")
+        detail.append(f"stdout={out!r}")
+        detail.append(f"stderr={err!r}")
+    return ok, detail
 
-def main():
+def run_one(input_path, expected_path=None, runner=run_subprocess):
+    t0 = time.perf_counter()
+    out, err, code = runner(input_path)
+    ms = (time.perf_counter() - t0) * 1000
+    name = os.path.relpath(input_path)
+
+    exp = None
+    if expected_path:
+        with open(expected_path, "rb") as f:
+            exp = f.read()
+    ok, detail = check_result(out, err, code, exp)
+    print(f"{'OK' if ok else 'FAIL'} -- {name} ({ms:.2f} ms)")
+    for line in detail:
+        print(f"  {line}")
+    return ok
+
+def main(argv=None):
     global OK
+    parser = argparse.ArgumentParser(description="Run spec-testcases against main.py.")
+    parser.add_argument("--subprocess", action="store_true",
+                        help="run each case end-to-end via 'make run' instead of in-process")
+    args = parser.parse_args(argv)
+    runner = run_subprocess if args.subprocess else run_inprocess
+    if not args.subprocess:
+        load_main()   # keep the one-time import out of per-case timings
+
+    t0 = time.perf_counter()
+    n = 0
     # VALID
     for ip in sorted(glob.glob("spec-testcases/valid/*.input")):
-        OK = run_one(ip, ip.replace(".input", ".output")) and OK
+        OK = run_one(ip, ip.replace(".input", ".output"), runner) and OK
+        n += 1
     # INVALID
     for ip in sorted(glob.glob("spec-testcases/invalid/*.input")):
-        OK = run_one(ip, None) and OK
+        OK = run_one(ip, None, runner) and OK
+        n += 1
+    mode = "subprocess" if args.subprocess else "in-process"
+    print(f"{n} cases, {mode}, {(time.perf_counter() - t0) * 1000:.1f} ms total")
     sys.exit(0 if OK else 1)
 
 if __name__ == "__main__":
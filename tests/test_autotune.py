@@ -0,0 +1,132 @@
+import hashlib
+import json
+import pytest
+
+import autotune as at
+import collision_sha256
+from candidates import hasher
+
+RATES = {"threads": 100.0, "processes": 300.0, "numpy": 500.0}
+
+class StubFinder:
+    def __init__(self, engine, workers, batch_size):
+        self.rate = RATES[engine] + workers + (batch_size or 0) / 1e6
+        self.tick = None
+
+    def run(self):
+        assert self.tick is not None
+        return None
+
+    def stats(self):
+        return {"hashes_per_s": self.rate}
+
+@pytest.fixture
+def build(monkeypatch):
+    monkeypatch.setattr(at.os, "cpu_count", lambda: 4)
+    calls = []
+    def build(engine, width, workers, batch_size):
+        calls.append((engine, width, workers, batch_size))
+        return StubFinder(engine, workers, batch_size)
+    build.calls = calls
+    return build
+
+def tune(build, path, have_numpy=True, width=4, table_mb=64, retune=False):
+    return at.autotune(build, "sha256", have_numpy=have_numpy, width=width, table_mb=table_mb,
+                       seconds=0, path=str(path), retune=retune)
+
+# -------------------------------------------------------------------
+# autotune
+# -------------------------------------------------------------------
+
+def test_measures_every_candidate_and_caches_the_fastest(build, tmp_path):
+    path = tmp_path / "sub" / "autotune.json"
+    best = tune(build, path)
+    assert len(build.calls) == len(at.candidates(4, True))
+    assert {width for _, width, _, _ in build.calls} == {at.TUNE_WIDTH}
+    assert best["engine"] == "numpy" and best["batch_size"] == 65536
+    [entry] = json.loads(path.read_text()).values()
+    assert entry["best"] == best and len(entry["results"]) == len(build.calls)
+
+def test_cached_result_is_reused_without_building(build, tmp_path):
+    path = tmp_path / "autotune.json"
+    first = tune(build, path)
+    build.calls.clear()
+    assert tune(build, path) == first
+    assert build.calls == []
+
+def test_cache_is_keyed_by_width_and_table(build, tmp_path):
+    path = tmp_path / "autotune.json"
+    tune(build, path, width=4, table_mb=64)
+    for width, table_mb in [(5, 64), (4, 128)]:
+        build.calls.clear()
+        tune(build, path, width=width, table_mb=table_mb)
+        assert build.calls
+    assert len(json.loads(path.read_text())) == 3
+
+def test_cached_numpy_winner_is_skipped_without_numpy(build, tmp_path):
+    path = tmp_path / "autotune.json"
+    assert tune(build, path)["engine"] == "numpy"
+    build.calls.clear()
+    best = tune(build, path, have_numpy=False)
+    assert best["engine"] == "processes"
+    assert build.calls == []
+
+def test_without_numpy_no_numpy_candidate_is_measured(build, tmp_path):
+    best = tune(build, tmp_path / "autotune.json", have_numpy=False)
+    assert best["engine"] == "processes"
+    assert all(engine != "numpy" for engine, _, _, _ in build.calls)
+
+def test_retune_measures_again(build, tmp_path, monkeypatch):
+    path = tmp_path / "autotune.json"
+    tune(build, path)
+    build.calls.clear()
+    monkeypatch.setitem(RATES, "threads", 1000.0)
+    assert tune(build, path)["engine"] == "numpy"              # still cached
+    assert build.calls == []
+    assert tune(build, path, retune=True)["engine"] == "threads"
+    assert build.calls
+    assert tune(build, path)["engine"] == "threads"            # the new measurement was cached
+
+def test_unreadable_cache_is_measured_again(build, tmp_path):
+    path = tmp_path / "autotune.json"
+    path.write_text("{not json")
+    tune(build, path)
+    assert build.calls
+
+# -------------------------------------------------------------------
+# Command line
+# -------------------------------------------------------------------
+
+@pytest.mark.parametrize("flags", [["--threads", "2"], ["--processes", "2"], ["--batch-size", "1024"]])
+def test_autotune_rejects_explicit_workers(flags, tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        collision_sha256.main(["--email", "a@auburn.edu", "--autotune",
+                               "--autotune-cache", str(tmp_path / "autotune.json")] + flags)
+    assert exc.value.code == 2
+    assert "drop --threads/--processes/--batch-size" in capsys.readouterr().err
+    assert not (tmp_path / "autotune.json").exists()
+
+# -------------------------------------------------------------------
+# candidates.hasher
+# -------------------------------------------------------------------
+
+def test_hasher_falls_back_to_hashlib_new(monkeypatch):
+    monkeypatch.delattr(hashlib, "sha512_256", raising=False)
+    if "sha512_256" not in hashlib.algorithms_available:
+        pytest.skip("sha512_256 is not available in this OpenSSL build")
+    h = hasher("sha512_256")
+    assert h(b"abc").digest() == hashlib.new("sha512_256", b"abc").digest()
+    assert h().digest_size == 32
+
+def test_hasher_rejects_an_unavailable_algorithm(monkeypatch):
+    monkeypatch.delattr(hashlib, "sha512_256", raising=False)
+    monkeypatch.setattr(hashlib, "algorithms_available", hashlib.algorithms_available - {"sha512_256"})
+    with pytest.raises(ValueError, match="not available"):
+        hasher("sha512_256")
+
+def test_hasher_rejects_an_unknown_name():
+    with pytest.raises(ValueError, match="Unknown hash algorithm"):
+        hasher("md5")
+
+def test_hasher_uses_the_hashlib_constructor():
+    assert hasher("sha256") is hashlib.sha256
@@ -0,0 +1,64 @@
+import threading
+import pytest
+from Deserializer.batch import Result, deserialize, deserialize_many
+from Deserializer.limits import Limits
+
+VALID = "(<x:abcds,y:1001,z:(<w:ab%2Ccd>)>)"
+EXPECTED = (
+    "begin-map\n"
+    "x -- string -- abcd\n"
+    "y -- num -- -7\n"
+    "z -- map -- \n"
+    "begin-map\n"
+    "w -- string -- ab,cd\n"
+    "end-map\n"
+    "end-map\n"
+)
+
+# -------------------------------------------------------------------
+# Single document
+# -------------------------------------------------------------------
+
+def test_deserialize_matches_cli_output():
+    assert deserialize(VALID) == Result(EXPECTED, None, 0)
+
+def test_deserialize_empty_map():
+    assert deserialize("(<>)").output == "begin-map\nend-map\n"
+
+def test_deserialize_error_does_not_exit_or_print(capsys):
+    result = deserialize("(<a :bs>)")
+    assert result.exit_code == 66
+    assert result.output is None
+    assert result.error == "NOSJ parse error: Expected ':' but found ' '"
+    assert capsys.readouterr() == ("", "")
+
+def test_deserialize_bytes_and_limits():
+    assert deserialize(VALID.encode()).output == EXPECTED
+    assert deserialize(VALID, Limits(max_depth=1)).exit_code == 66
+
+# -------------------------------------------------------------------
+# Many documents on a thread pool
+# -------------------------------------------------------------------
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_deserialize_many_preserves_order(workers):
+    docs = [VALID, "(<a:zz>)", "(<n:0110>)", "(<a :b>)"] * 25
+    results = deserialize_many(docs, workers=workers)
+    assert results == [deserialize(d) for d in docs]
+    assert [r.exit_code for r in results[:4]] == [0, 66, 0, 66]
+
+def test_deserialize_many_is_thread_safe_from_many_callers():
+    docs = [f"(<a:{i:b},b:(<c:s{i % 7}s>)>)" for i in range(200)]
+    expected = [deserialize(d) for d in docs]
+    failures = []
+
+    def caller():
+        if deserialize_many(docs, workers=4) != expected:
+            failures.append(True)
+
+    threads = [threading.Thread(target=caller) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not failures
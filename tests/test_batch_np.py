@@ -0,0 +1,103 @@
+import hashlib
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from candidates import CandidateSpace
+from batch_np import NumpyCollisionFinder
+
+EMAIL = b"a@auburn.edu"
+
+def finder(width, batch_size=1024):
+    return NumpyCollisionFinder(EMAIL, last_n=width, progress_every=0, batch_size=batch_size)
+
+def assert_pair(f, pair, a=None, b=None):
+    m1, m2 = pair
+    assert m1 != m2
+    assert hashlib.sha256(m1).digest()[-f.last_n:] == hashlib.sha256(m2).digest()[-f.last_n:]
+    if a is not None:
+        assert {m1, m2} == {f.space.message(a), f.space.message(b)}
+
+# -------------------------------------------------------------------
+# Keys
+# -------------------------------------------------------------------
+
+@pytest.mark.parametrize("width", [1, 3, 8, 12])
+def test_keys_are_the_table_keys(width):
+    f = finder(width)
+    keys = f._keys(f.space.suffix_block(0, 16), 16)
+    assert keys.dtype == np.uint64
+    assert [int(k) for k in keys] == [CandidateSpace.key(f.space.suffix(c)) for c in range(16)]
+
+# -------------------------------------------------------------------
+# _search_batch
+# -------------------------------------------------------------------
+
+def test_duplicate_inside_one_batch():
+    f = finder(1)
+    # 300 one-byte suffixes must repeat; nothing has been accumulated yet.
+    assert_pair(f, f._search_batch(0, 300))
+
+def test_hit_against_accumulated_keys():
+    f = finder(2)
+    seen = {}
+    for cid in range(32):
+        s = f.space.suffix(cid)
+        if s in seen:
+            break
+        seen[s] = cid
+    n = len(seen)
+    assert f._search_batch(0, n) is None
+    [(level, keys, ids)] = f.levels
+    assert level == 0 and keys.size == n == f.stored
+    assert np.all(keys[:-1] <= keys[1:])
+    later = next(c for c in range(n, 1 << 20) if f.space.suffix(c) in seen)
+    assert_pair(f, f._search_batch(later, 1), seen[f.space.suffix(later)], later)
+
+def test_key_only_match_is_rejected_above_8_bytes():
+    f = finder(12)
+    # Every candidate gets the same key: only regeneration can tell them apart.
+    f._keys = lambda block, count: np.zeros(count, dtype=np.uint64)
+    assert f._search_batch(0, 4) is None            # inside the batch
+    assert f._search_batch(4, 4) is None            # against the accumulated keys
+
+def distinct_blocks(f, blocks, size):
+    """Consecutive candidate ranges of `size` whose suffixes are all distinct."""
+    seen, start, out = set(), 0, []
+    while len(out) < blocks:
+        sfx = [f.space.suffix(c) for c in range(start, start + size)]
+        if seen.isdisjoint(sfx) and len(set(sfx)) == size:
+            seen.update(sfx)
+            out.append(start)
+        start += size
+    return out
+
+def test_levels_merge_like_a_binary_counter():
+    f = finder(8)
+    for i, start in enumerate(distinct_blocks(f, 7, 4), 1):
+        assert f._search_batch(start, 4) is None
+        levels = [level for level, _, _ in f.levels]
+        assert levels == [b for b in range(3, -1, -1) if i >> b & 1]
+        assert all(np.all(k[:-1] <= k[1:]) and k.size == ids.size for _, k, ids in f.levels)
+    assert f.stored == sum(k.size for _, k, _ in f.levels) == 28
+    for _, keys, ids in f.levels:
+        assert [int(k) for k in keys] == [CandidateSpace.key(f.space.suffix(int(c))) for c in ids]
+
+def test_full_table_is_searched_but_not_grown():
+    f = finder(2)
+    f.capacity = 6
+    first, second, third = distinct_blocks(f, 3, 4)
+    assert f._search_batch(first, 4) is None
+    assert f._search_batch(second, 4) is None
+    assert f.stored == 6 and f.stats()["entries"] == 6
+    assert f._search_batch(third, 4) is None
+    assert f.stored == 6
+    # Candidates stored before the budget ran out still collide with new ones.
+    stored = {f.space.suffix(c): c for c in range(first, first + 4)}
+    later = next(c for c in range(third + 4, 1 << 22) if f.space.suffix(c) in stored)
+    assert_pair(f, f._search_batch(later, 1), stored[f.space.suffix(later)], later)
+
+def test_run_returns_a_collision():
+    f = finder(2, batch_size=256)
+    assert_pair(f, f.run())
+    assert f.stats()["found_s"] is not None
@@ -0,0 +1,85 @@
+import hashlib
+import pytest
+from candidates import HEADS, MAX_ID, CandidateSpace, make_id
+from table import ID_BITS, PROBE_LIMIT, CompactTable
+
+PREFIX = b"a@auburn.edu||saltsalts|"
+
+# -------------------------------------------------------------------
+# CompactTable.insert
+# -------------------------------------------------------------------
+
+def test_tag_match_is_only_returned_when_confirmed():
+    table = CompactTable(1024)
+    assert table.insert(0xABCD_0001, 7, lambda o: True) is None
+    assert table.insert(0xABCD_0001, 8, lambda o: o == 7) == 7
+    # Same tag, but the regenerated candidate disagrees: stored, not reported.
+    assert table.insert(0xABCD_0001, 9, lambda o: False) is None
+    assert table.size == 2
+
+def test_other_tag_in_the_same_slot_is_never_confirmed():
+    table = CompactTable(1024)
+    table.insert(1 << 10 | 5, 1, lambda o: True)
+    asked = []
+    assert table.insert(2 << 10 | 5, 2, lambda o: asked.append(o)) is None
+    assert asked == []
+    assert table.size == 2
+
+def test_probe_wraps_around_the_end():
+    table = CompactTable(8)
+    table.insert(1 << 3 | 7, 1, lambda o: False)
+    table.insert(2 << 3 | 7, 2, lambda o: False)
+    assert table.slots[7] and table.slots[0]
+    assert table.insert(2 << 3 | 7, 3, lambda o: o == 2) == 2
+
+def test_probe_limit_stops_inserting():
+    table = CompactTable(4 * PROBE_LIMIT)
+    for tag in range(1, PROBE_LIMIT + 1):
+        table.insert(tag << table.index_bits, tag, lambda o: False)
+    assert table.insert((PROBE_LIMIT + 1) << table.index_bits, 999, lambda o: False) is None
+    assert table.size == PROBE_LIMIT
+    assert table.insert(1 << table.index_bits, 1000, lambda o: o == 1) == 1
+
+def test_largest_id_fits_the_slot():
+    assert MAX_ID + 1 < 1 << ID_BITS
+    assert make_id(255, (1 << 32) - 2) == MAX_ID
+    with pytest.raises(ValueError):
+        make_id(255, (1 << 32) - 1)
+    table = CompactTable(1024)
+    table.insert(3, MAX_ID, lambda o: False)
+    assert table.insert(3, 0, lambda o: True) == MAX_ID
+
+# -------------------------------------------------------------------
+# CandidateSpace
+# -------------------------------------------------------------------
+
+@pytest.mark.parametrize("prefix, algo", [
+    (PREFIX, "sha256"),
+    (PREFIX * 3, "sha256"),          # >= one block: midstate path
+    (PREFIX * 6, "blake2b"),         # 128-byte blocks
+])
+def test_suffixes_match_regenerated_messages(prefix, algo):
+    space = CandidateSpace(prefix, 4, b"seed", algo)
+    assert space.use_midstate == (len(prefix) >= hashlib.new(algo).block_size)
+    first = make_id(3, HEADS - 10)
+    pairs = space.suffixes(first, 20)
+    assert [cid for cid, _ in pairs] == list(range(first, first + 20))
+    for cid, suffix in pairs:
+        message = space.message(cid)
+        assert message.startswith(prefix)
+        assert hashlib.new(algo, message).digest()[-4:] == suffix == space.suffix(cid)
+    assert space.suffix_block(first, 20) == b"".join(s for _, s in pairs)
+
+def test_workers_rebuild_the_same_messages():
+    a = CandidateSpace(PREFIX, 4, b"seed")
+    b = CandidateSpace(PREFIX, 4, b"seed")
+    c = CandidateSpace(PREFIX, 4, b"other")
+    cid = make_id(1, 12345)
+    assert a.message(cid) == b.message(cid)
+    assert a.message(cid) != c.message(cid)
+    assert a.message(cid) != a.message(cid + 1)
+
+def test_width_beyond_the_digest_is_rejected():
+    with pytest.raises(ValueError):
+        CandidateSpace(PREFIX, 33, algo="sha256")
+    assert CandidateSpace(PREFIX, 64, algo="sha3_512").suffix(0)
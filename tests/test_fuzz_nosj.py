@@ -0,0 +1,78 @@
+import itertools
+import random
+import signal
+import string
+import sys
+import pytest
+import fuzz_nosj
+from Deserializer.deserializer import Deserializer
+from Deserializer.incremental import SpanParser
+
+# -------------------------------------------------------------------
+# Oracle
+# -------------------------------------------------------------------
+
+@pytest.mark.parametrize("src", fuzz_nosj.load_seeds())
+def test_seeds_pass_differential_check(src):
+    kind, _, detail = fuzz_nosj.run_one(src, timeout=0)
+    assert kind == "ok", detail
+
+def test_check_signatures_distinguish_outcomes():
+    assert fuzz_nosj.check("(<a:1010>)").startswith("ok:")
+    assert fuzz_nosj.check("(<a :1>)").startswith("parse:")
+    assert fuzz_nosj.check("(<a:abcd>)").startswith("value:")
+
+def test_deep_nesting_paths_agree():
+    depth = 400
+    kind, _, detail = fuzz_nosj.run_one("(<a:" * depth + "1" + ">)" * depth, timeout=0)
+    assert kind == "ok", detail
+
+def test_timeout_without_main_installing_a_handler():
+    keys = ("".join(k) for k in itertools.product(string.ascii_lowercase, repeat=4))
+    src = "(<" + ",".join(f"{k}:1010" for k, _ in zip(keys, range(20000))) + ">)"
+    before = signal.getsignal(signal.SIGALRM)
+    kind, sig, _ = fuzz_nosj.run_one(src, timeout=0.01)
+    assert (kind, sig) == ("timeout", "timeout")
+    assert signal.getsignal(signal.SIGALRM) == before
+
+def spin(*args):
+    while True:
+        pass
+
+def spin_in_decode(val, _decode_value=Deserializer.decode_value):
+    if sys._getframe(1).f_code.co_name == "_decode_into":
+        spin()
+    return _decode_value(val)
+
+@pytest.mark.parametrize("target, name, slow", [
+    (SpanParser, "parse_map_at", spin),                 # inside IncrementalDocument._full_parse
+    (Deserializer, "decode_value", staticmethod(spin_in_decode)),  # inside Deserializer._decode_into
+])
+def test_timeout_inside_a_library_except_exception(monkeypatch, target, name, slow):
+    # The alarm fires under an `except Exception` in the library; it must
+    # still surface as a timeout, not as a differential mismatch.
+    monkeypatch.setattr(target, name, slow)
+    kind, sig, _ = fuzz_nosj.run_one("(<a:1010,b:abs>)", timeout=0.05)
+    assert (kind, sig) == ("timeout", "timeout")
+
+# -------------------------------------------------------------------
+# Mutation, minimization, campaign
+# -------------------------------------------------------------------
+
+def test_mutate_is_deterministic_for_a_seed():
+    corpus = fuzz_nosj.load_seeds()
+    a = fuzz_nosj.mutate(corpus[0], random.Random(7), corpus)
+    b = fuzz_nosj.mutate(corpus[0], random.Random(7), corpus)
+    assert a == b
+
+def test_minimize_keeps_signature(monkeypatch):
+    # Pretend any input containing "%GZ" crashes.
+    def fake_run_one(src, timeout):
+        return ("crash", "crash:fake", None) if "%GZ" in src else ("ok", "ok", None)
+    monkeypatch.setattr(fuzz_nosj, "run_one", fake_run_one)
+    assert fuzz_nosj.minimize("(<a:1010,b:ab%GZcd,c:abs>)", "crash:fake", 0) == "%GZ"
+
+def test_short_campaign_finds_nothing(tmp_path):
+    stats = fuzz_nosj.fuzz(runs=300, seed=5370, timeout=0, out_dir=str(tmp_path), report_every=0)
+    assert stats["execs"] == 300
+    assert stats["findings"] == {}
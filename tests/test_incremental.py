@@ -0,0 +1,109 @@
+import random
+import pytest
+from Deserializer.deserializer import Deserializer
+from Deserializer.incremental import IncrementalDocument, MapSpan
+from Deserializer.parser import NosjParser
+
+def full_run(text):
+    """Reference: what main.py would emit (stdout, error message)."""
+    try:
+        data = NosjParser(text).parse()
+        lines = Deserializer.render_map(data)
+    except Exception as e:
+        return None, str(e)
+    return "begin-map\n" + "".join(line + "\n" for line in lines) + "end-map\n", None
+
+DOC = "(<a:(<x:1010,y:abs>),b:(<z:ab%2Ccd>),c:0>)"
+
+# -------------------------------------------------------------------
+# Equivalence with a full parse + process_map run
+# -------------------------------------------------------------------
+
+def test_initial_output_matches_full_run():
+    doc = IncrementalDocument(DOC)
+    assert (doc.output, doc.error) == full_run(DOC)
+
+def test_update_inside_submap_matches_full_run():
+    doc = IncrementalDocument(DOC)
+    new = DOC.replace("1010", "0110110")
+    doc.update(new)
+    assert (doc.output, doc.error) == full_run(new)
+    assert "x -- num -- 54" in doc.output
+
+def test_apply_edits_multiple_ranges():
+    doc = IncrementalDocument(DOC)
+    i = DOC.index("1010")
+    j = DOC.index("ab%2Ccd")
+    doc.apply_edits([(i, i + 4, "1"), (j, j + 7, "hello worlds")])
+    new = DOC[:i] + "1" + DOC[i + 4:j] + "hello worlds" + DOC[j + 7:]
+    assert doc.text == new
+    assert (doc.output, doc.error) == full_run(new)
+
+def test_overlapping_edits_rejected():
+    doc = IncrementalDocument(DOC)
+    with pytest.raises(ValueError):
+        doc.apply_edits([(3, 8, ""), (5, 9, "")])
+
+# -------------------------------------------------------------------
+# Invalidity is reported exactly like a full run
+# -------------------------------------------------------------------
+
+def test_edit_introducing_value_error():
+    doc = IncrementalDocument(DOC)
+    new = DOC.replace("abs", "abc")
+    doc.update(new)
+    assert doc.output is None
+    assert doc.error == full_run(new)[1]
+    assert doc.error == "Complex string must contain at least one %XY sequence: abc"
+
+def test_edit_introducing_parse_error_then_repair():
+    doc = IncrementalDocument(DOC)
+    broken = DOC.replace("y:abs", "y :abs")
+    doc.update(broken)
+    assert doc.error == full_run(broken)[1]
+    assert doc.error.startswith("NOSJ parse error")
+    doc.update(DOC)
+    assert (doc.output, doc.error) == full_run(DOC)
+
+def test_emit_uses_standard_error_exit(capsys):
+    doc = IncrementalDocument("(<a:zz>)")
+    with pytest.raises(SystemExit) as se:
+        doc.emit()
+    assert se.value.code == 66
+    assert capsys.readouterr().err.startswith("ERROR -- ")
+
+# -------------------------------------------------------------------
+# Reuse of untouched sub-maps
+# -------------------------------------------------------------------
+
+def test_untouched_sibling_map_is_reused():
+    doc = IncrementalDocument(DOC)
+    doc.output
+    sibling = doc.root.entries["b"]
+    cached = sibling.rendered
+    doc.update(DOC.replace("1010", "1"))
+    assert doc.root.entries["b"] is sibling
+    assert sibling.rendered is cached
+    assert doc.reparsed < len(doc.text)
+
+def test_only_enclosing_map_is_reparsed():
+    doc = IncrementalDocument(DOC)
+    doc.update(DOC.replace("ab%2Ccd", "ab%2Ccd%21"))
+    assert isinstance(doc.root.entries["b"], MapSpan)
+    assert doc.reparsed == len("(<z:ab%2Ccd%21>)")
+
+def test_random_edits_match_full_run():
+    rng = random.Random(5370)
+    alphabet = "(<>):,abs01%2C "
+    text = DOC
+    doc = IncrementalDocument(text)
+    for _ in range(500):
+        a = rng.randint(0, len(text))
+        b = rng.randint(a, min(len(text), a + 3))
+        rep = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 3)))
+        text = text[:a] + rep + text[b:]
+        doc.update(text)
+        assert (doc.output, doc.error) == full_run(text)
+        if doc.error is not None and rng.random() < 0.5:
+            text = DOC
+            doc.update(text)
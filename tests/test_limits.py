@@ -0,0 +1,98 @@
+import os
+import subprocess
+import sys
+import pytest
+from Deserializer.deserializer import Deserializer
+from Deserializer.limits import Budget, LimitExceeded, Limits
+from Deserializer.parser import NosjParser
+
+def parse(src, **limits):
+    return NosjParser(src, Limits(**limits).start()).parse()
+
+# -------------------------------------------------------------------
+# NosjParser enforcement
+# -------------------------------------------------------------------
+
+def test_no_limits_by_default():
+    assert parse("(<a:(<b:1010>)>)") == {"a": {"b": "1010"}}
+
+def test_max_depth():
+    assert parse("(<a:(<b:1>)>)", max_depth=2) == {"a": {"b": "1"}}
+    with pytest.raises(LimitExceeded, match="depth 1"):
+        parse("(<a:(<b:1>)>)", max_depth=1)
+
+def test_max_entries():
+    with pytest.raises(LimitExceeded, match="3 entries"):
+        parse("(<a:1,b:1,c:(<d:1>)>)", max_entries=3)
+
+def test_max_value_len_stops_scanning():
+    with pytest.raises(LimitExceeded, match="4 characters"):
+        parse("(<a:abcdefghs>)", max_value_len=4)
+    assert parse("(<a:abcs>)", max_value_len=4) == {"a": "abcs"}
+
+def test_max_num_bits_only_applies_to_nums():
+    with pytest.raises(LimitExceeded, match="8 bits"):
+        parse("(<a:010101010>)", max_num_bits=8)
+    assert parse("(<a:01010101 s>)", max_num_bits=8) == {"a": "01010101 s"}
+
+def test_max_num_bits_ignores_the_optional_newline():
+    with pytest.raises(LimitExceeded, match="3 bits"):
+        parse("(<a:0101\n>)", max_num_bits=3)
+    assert parse("(<a:0101\n>)", max_num_bits=4) == {"a": "0101\n"}
+
+def test_max_input_bytes():
+    with pytest.raises(LimitExceeded):
+        parse("(<a:1010>)", max_input_bytes=5)
+
+def test_deadline():
+    src = "(<" + ",".join("a:1" for _ in range(1000)) + ">)"
+    budget = Budget(Limits(deadline=1.0), expires_at=0.0)
+    with pytest.raises(LimitExceeded, match="Deadline"):
+        NosjParser(src, budget).parse()
+
+def test_limit_exceeded_is_value_error():
+    assert issubclass(LimitExceeded, ValueError)
+
+# -------------------------------------------------------------------
+# Deserializer enforcement -> standardized ERROR -- + exit(66)
+# -------------------------------------------------------------------
+
+def test_process_map_enforces_budget(capsys):
+    with pytest.raises(SystemExit) as se:
+        Deserializer.process_map({"a": {"b": {"c": "1"}}}, Limits(max_depth=2).start())
+    assert se.value.code == 66
+    assert capsys.readouterr().err == "ERROR -- Map nesting exceeds depth 2\n"
+
+def test_render_map_num_bits():
+    with pytest.raises(LimitExceeded):
+        Deserializer.render_map({"a": "1" * 65}, Limits(max_num_bits=64).start())
+
+# -------------------------------------------------------------------
+# Configuration from the environment
+# -------------------------------------------------------------------
+
+def test_from_env():
+    limits = Limits.from_env({"NOSJ_MAX_DEPTH": "16", "NOSJ_DEADLINE": "0.5", "NOSJ_MAX_ENTRIES": ""})
+    assert limits.max_depth == 16
+    assert limits.deadline == 0.5
+    assert limits.max_entries is None
+
+@pytest.mark.parametrize("raw", ["abc", "0", "-3"])
+def test_from_env_rejects_bad_values(raw):
+    with pytest.raises(ValueError, match="NOSJ_MAX_DEPTH"):
+        Limits.from_env({"NOSJ_MAX_DEPTH": raw})
+
+# -------------------------------------------------------------------
+# main.py reading from a pipe
+# -------------------------------------------------------------------
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "main.py")
+
+@pytest.mark.parametrize("limit, code", [(100, 66), (200, 0)])
+def test_piped_input_is_limited_in_bytes(limit, code):
+    src = ("(<a:" + "ab%2C" * 10 + "è" * 40 + ">)").encode("utf-8")    # 136 bytes, 96 characters
+    proc = subprocess.run([sys.executable, MAIN, "/dev/stdin"], input=src, capture_output=True,
+                          env=dict(os.environ, NOSJ_MAX_INPUT_BYTES=str(limit), PYTHONIOENCODING="utf-8"))
+    assert proc.returncode == code, proc.stderr
+    if code:
+        assert proc.stderr == b"ERROR -- Input exceeds 100 bytes\n"
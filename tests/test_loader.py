@@ -0,0 +1,68 @@
+import io
+import pytest
+from Deserializer import NosjError, load, loads
+from Deserializer.deserializer import Deserializer
+from Deserializer.limits import Limits
+
+# -------------------------------------------------------------------
+# Native values
+# -------------------------------------------------------------------
+
+def test_loads_flat_map_all_types():
+    assert loads("(<a:1010,b:abcds,c:ab%2Ccd,d:>)") == {"a": -6, "b": "abcd", "c": "ab,cd", "d": ""}
+
+def test_loads_nested_map_preserves_order():
+    data = loads("(<z:(<y:1000,x:ef ghs>),a:0>)")
+    assert data == {"z": {"y": -8, "x": "ef gh"}, "a": 0}
+    assert list(data) == ["z", "a"]
+    assert list(data["z"]) == ["y", "x"]
+
+def test_loads_returns_plain_types():
+    data = loads("(<a:0110,b:abs>)")
+    assert type(data["a"]) is int
+    assert type(data["b"]) is str
+
+def test_load_text_and_binary_files():
+    assert load(io.StringIO("  (<a:1010>)\n")) == {"a": -6}
+    assert load(io.BytesIO("(<a:%C3%A8s%20>)".encode("utf-8"))) == {"a": "ès "}
+
+def test_decode_map_on_plain_dicts():
+    assert Deserializer.decode_map({"a": "1010", "b": {"c": "abcds"}}) == {"a": -6, "b": {"c": "abcd"}}
+
+# -------------------------------------------------------------------
+# Structured errors instead of exit(66)
+# -------------------------------------------------------------------
+
+def test_parse_error_has_position():
+    with pytest.raises(NosjError) as err:
+        loads("(<a :bs>)")
+    assert err.value.kind == "parse"
+    assert err.value.position == 3
+    assert str(err.value) == "NOSJ parse error: Expected ':' but found ' '"
+
+def test_value_error_has_key_path():
+    with pytest.raises(NosjError) as err:
+        loads("(<a:1,b:(<c:(<d:abcd>)>)>)")
+    assert err.value.kind == "value"
+    assert err.value.path == ("b", "c", "d")
+    assert err.value.message == "Complex string must contain at least one %XY sequence: abcd"
+
+def test_key_error_on_plain_dict():
+    with pytest.raises(NosjError) as err:
+        Deserializer.decode_map({"outer": {"Inner": "abcds"}})
+    assert err.value.kind == "key"
+    assert err.value.path == ("outer", "Inner")
+
+def test_limit_error_kind():
+    with pytest.raises(NosjError) as err:
+        loads("(<a:(<b:1>)>)", Limits(max_depth=1))
+    assert err.value.kind == "limit"
+
+def test_load_respects_max_input_bytes():
+    with pytest.raises(NosjError) as err:
+        load(io.BytesIO(b"(<a:1010>)"), Limits(max_input_bytes=4))
+    assert err.value.kind == "limit"
+
+def test_nosj_error_is_value_error_and_never_exits():
+    with pytest.raises(ValueError):
+        loads("(<a:zz>)")
@@ -0,0 +1,86 @@
+import hashlib
+import pytest
+from collision_sha256 import CollisionFinder
+
+EMAIL = b"a@auburn.edu"
+
+def finder(width, groups=1, kway=2, batch_size=64):
+    records = []
+    f = CollisionFinder(EMAIL, last_n=width, threads=1, progress_every=0, batch_size=batch_size,
+                        table_mb=1, groups=groups, kway=kway,
+                        on_group=lambda n, messages: records.append((n, messages)))
+    return f, records
+
+def suffix(width, message):
+    return hashlib.sha256(message).digest()[-width:]
+
+# -------------------------------------------------------------------
+# _worker / _publish: whole searches, driven synchronously
+# -------------------------------------------------------------------
+
+@pytest.mark.parametrize("width", [1, 2])
+@pytest.mark.parametrize("groups,kway", [(5, 2), (3, 3), (4, 4)])
+def test_groups_of_kway_messages_sharing_a_suffix(width, groups, kway):
+    f, records = finder(width, groups, kway)
+    f._worker(0)
+    assert f.stop_evt.is_set()
+    assert [n for n, _ in records] == list(range(1, groups + 1))
+    assert len({tuple(messages) for _, messages in records}) == groups
+    for _, messages in records:
+        assert len(set(messages)) == kway
+        assert len({suffix(width, m) for m in messages}) == 1
+        assert all(m.startswith(EMAIL) for m in messages)
+    if kway > 2:
+        # One group per suffix: later matches of a finished suffix start no new group.
+        assert len({suffix(width, messages[0]) for _, messages in records}) == groups
+
+@pytest.mark.parametrize("width", [1, 2])
+def test_default_path_yields_exactly_one_pair(width):
+    f = CollisionFinder(EMAIL, last_n=width, threads=1, progress_every=0, batch_size=64, table_mb=1)
+    f._worker(0)
+    assert f.emitted == 1
+    m1, m2 = f.found_pair
+    assert m1 != m2 and suffix(width, m1) == suffix(width, m2)
+    assert f.found_at is not None
+
+def test_run_streams_every_group_and_returns_the_first_match():
+    f, records = finder(1, groups=3, kway=3)
+    pair = f.run()
+    assert len(records) == 3 and f.emitted == 3
+    assert pair == f.found_pair
+    assert pair[0] != pair[1] and suffix(1, pair[0]) == suffix(1, pair[1])
+
+# -------------------------------------------------------------------
+# _record
+# -------------------------------------------------------------------
+
+def test_record_completes_a_group_at_kway_members():
+    f, records = finder(2, groups=2, kway=3)
+    s = f.space.suffix(0)
+    assert f._record(s, 0, 1) is False
+    assert f.found_pair == (f.space.message(0), f.space.message(1))
+    assert records == []
+    assert f._record(s, 0, 2) is False                 # group complete, one more to go
+    assert records == [(1, [f.space.message(c) for c in (0, 1, 2)])]
+    assert f._record(s, 0, 3) is False                 # past kway: ignored
+    assert len(records) == 1 and f.emitted == 1
+    t = f.space.suffix(10)
+    assert f._record(t, 10, 11) is False
+    assert f._record(t, 10, 12) is True
+    assert f.emitted == 2 and len(records) == 2
+
+def test_record_after_the_last_group_stops_without_emitting():
+    f, records = finder(2, groups=1, kway=2)
+    s = f.space.suffix(0)
+    assert f._record(s, 0, 1) is True
+    assert f._record(s, 0, 2) is True
+    assert f.emitted == 1 and len(records) == 1
+    assert f.found_pair == (f.space.message(0), f.space.message(1))
+
+def test_record_pairs_every_extra_match_with_the_first():
+    f, records = finder(2, groups=3, kway=2)
+    s = f.space.suffix(0)
+    assert f._record(s, 0, 1) is False
+    assert f._record(s, 0, 2) is False
+    assert f._record(s, 0, 3) is True
+    assert [messages for _, messages in records] == [[f.space.message(0), f.space.message(c)] for c in (1, 2, 3)]
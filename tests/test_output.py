@@ -0,0 +1,78 @@
+import io
+from contextlib import redirect_stdout
+import pytest
+from Deserializer.deserializer import Deserializer
+from Deserializer.output import DEFAULT_SPILL_THRESHOLD, SpillBuffer
+
+def binary_stream():
+    """A text stream with a .buffer but no real fd (like a captured stdout)."""
+    raw = io.BytesIO()
+    return raw, io.TextIOWrapper(raw, encoding="utf-8", newline="\n")
+
+# -------------------------------------------------------------------
+# In-memory path
+# -------------------------------------------------------------------
+
+def test_small_output_stays_in_memory():
+    with SpillBuffer(threshold=1024) as buf:
+        buf.write("begin-map\n")
+        buf.write("a -- num -- -6\n")
+        assert not buf.spilled
+        out = io.StringIO()
+        buf.copy_to(out)
+    assert out.getvalue() == "begin-map\na -- num -- -6\n"
+
+def test_works_with_redirect_stdout():
+    with SpillBuffer(threshold=4) as buf:
+        with redirect_stdout(buf):
+            Deserializer.process_map({"a": "1010", "b": "abcds"})
+        assert buf.spilled
+        assert buf.getvalue() == "a -- num -- -6\nb -- string -- abcd\n"
+
+# -------------------------------------------------------------------
+# Spilled path
+# -------------------------------------------------------------------
+
+def test_spills_past_threshold_and_copies_bytes():
+    lines = [f"k -- string -- café {i}\n" for i in range(1000)]
+    with SpillBuffer(threshold=100) as buf:
+        for line in lines:
+            buf.write(line)
+        assert buf.spilled
+        raw, stream = binary_stream()
+        stream.write("")
+        buf.copy_to(stream)
+        stream.flush()
+    assert raw.getvalue() == "".join(lines).encode("utf-8")
+
+def test_spilled_copy_to_plain_text_stream():
+    text = "è" * 5000
+    with SpillBuffer(threshold=10) as buf:
+        buf.write(text)
+        out = io.StringIO()
+        buf.copy_to(out)
+    assert out.getvalue() == text
+
+def test_spilled_copy_to_real_file(tmp_path):
+    path = tmp_path / "out.txt"
+    with SpillBuffer(threshold=0) as buf:
+        buf.write("begin-map\nend-map\n")
+        with open(path, "w", newline="\n") as f:
+            f.write("")
+            buf.copy_to(f)
+    assert path.read_bytes() == b"begin-map\nend-map\n"
+
+def test_unencodable_output_fails_before_emitting():
+    with SpillBuffer(threshold=0, encoding="ascii") as buf:
+        with pytest.raises(UnicodeEncodeError):
+            buf.write("è")
+
+# -------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------
+
+def test_threshold_from_env():
+    assert SpillBuffer.threshold_from_env({}) == DEFAULT_SPILL_THRESHOLD
+    assert SpillBuffer.threshold_from_env({"NOSJ_SPILL_THRESHOLD": "0"}) == 0
+    with pytest.raises(ValueError, match="NOSJ_SPILL_THRESHOLD"):
+        SpillBuffer.threshold_from_env({"NOSJ_SPILL_THRESHOLD": "lots"})
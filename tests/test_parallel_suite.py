@@ -0,0 +1,41 @@
+import parallel_suite
+
+def make_cases(tmp_path):
+    valid = tmp_path / "valid"
+    invalid = tmp_path / "invalid"
+    valid.mkdir()
+    invalid.mkdir()
+    (valid / "0001.input").write_bytes(b"(<a:1010>)")
+    (valid / "0001.output").write_bytes(b"begin-map\na -- num -- -6\nend-map\n")
+    (invalid / "0001.input").write_bytes(b"(<a :bs>)")
+    return valid, invalid
+
+def test_discover_pairs_inputs_with_outputs(tmp_path):
+    valid, invalid = make_cases(tmp_path)
+    cases = parallel_suite.discover([str(tmp_path)])
+    assert cases == [
+        (str(invalid / "0001.input"), None),
+        (str(valid / "0001.input"), str(valid / "0001.output")),
+    ]
+
+def test_case_key_tracks_input_expected_and_sources(tmp_path):
+    valid, _ = make_cases(tmp_path)
+    ip, op = str(valid / "0001.input"), str(valid / "0001.output")
+    key = parallel_suite.case_key(ip, op, "src-a")
+    assert key == parallel_suite.case_key(ip, op, "src-a")
+    assert key != parallel_suite.case_key(ip, op, "src-b")
+    assert key != parallel_suite.case_key(ip, None, "src-a")
+    (valid / "0001.output").write_bytes(b"begin-map\nend-map\n")
+    assert key != parallel_suite.case_key(ip, op, "src-a")
+
+def test_run_case_pass_fail_and_timeout(tmp_path):
+    valid, invalid = make_cases(tmp_path)
+    status, _, _ = parallel_suite.run_case(str(valid / "0001.input"), str(valid / "0001.output"), 30, False)
+    assert status == "pass"
+    status, _, _ = parallel_suite.run_case(str(invalid / "0001.input"), None, 30, False)
+    assert status == "pass"
+    status, _, detail = parallel_suite.run_case(str(invalid / "0001.input"), str(valid / "0001.output"), 30, False)
+    assert status == "fail"
+    assert detail[0] == "exit=66"
+    status, _, _ = parallel_suite.run_case(str(valid / "0001.input"), None, 1e-6, False)
+    assert status == "timeout"
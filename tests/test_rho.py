@@ -0,0 +1,75 @@
+import hashlib
+import pytest
+from rho import RhoCollisionFinder
+
+EMAIL = b"a@auburn.edu"
+
+def finder(width):
+    return RhoCollisionFinder(EMAIL, last_n=width, processes=1, progress_every=0)
+
+def walk(f, x, steps):
+    for _ in range(steps):
+        x = f._step(x)
+    return x
+
+def points(width):
+    return [i.to_bytes(width, "big") for i in range(256 ** width)]
+
+def simple_start(f, width, length):
+    """A start whose first `length` chain points are all distinct (no early cycle)."""
+    for x in points(width):
+        chain = [walk(f, x, i) for i in range(length + 1)]
+        if len(set(chain)) == len(chain):
+            return x
+
+# -------------------------------------------------------------------
+# _walk / _add on hand-built chains
+# -------------------------------------------------------------------
+
+@pytest.mark.parametrize("width", [1, 2])
+def test_start_on_the_other_chain_is_not_a_collision(width):
+    f = finder(width)
+    a = simple_start(f, width, 5)
+    b = walk(f, a, 2)                  # b lies on a's chain
+    end = walk(f, a, 5)
+    assert f._walk(a, 5, b, 3) is None
+    assert f._add(end, a, 5) is None
+    assert f._add(end, b, 3) is None
+    assert f.points[end] == (a, 5)     # the longer chain stays
+
+@pytest.mark.parametrize("width", [1, 2])
+def test_longer_chain_replaces_the_stored_one(width):
+    f = finder(width)
+    a = simple_start(f, width, 5)
+    b = walk(f, a, 2)
+    end = walk(f, a, 5)
+    assert f._add(end, b, 3) is None
+    assert f._add(end, a, 5) is None
+    assert f.points[end] == (a, 5)
+
+@pytest.mark.parametrize("width", [1, 2])
+def test_merging_chains_yield_the_colliding_predecessors(width):
+    f = finder(width)
+    images = {}
+    for x in points(width):
+        images.setdefault(f._step(x), []).append(x)
+    # x and y collide, and w steps onto x: chains (w, k + 1) and (y, k) merge after x / y.
+    w, x, y = next((w, x, y) for xs in images.values() if len(xs) > 1
+                   for x in xs for y in xs if x != y
+                   for w in images.get(x, ()) if w not in (x, y))
+    end = walk(f, y, 3)
+    assert f._add(end, y, 3) is None
+    pair = f._add(end, w, 4)
+    assert set(pair) == {x, y}
+    assert f._step(pair[0]) == f._step(pair[1])
+
+# -------------------------------------------------------------------
+# Search
+# -------------------------------------------------------------------
+
+def test_run_returns_a_collision():
+    f = finder(2)
+    m1, m2 = f.run()
+    assert m1 != m2 and m1.startswith(EMAIL) and m2.startswith(EMAIL)
+    assert hashlib.sha256(m1).digest()[-2:] == hashlib.sha256(m2).digest()[-2:]
+    assert f.stats()["found_s"] is not None
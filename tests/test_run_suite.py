@@ -0,0 +1,37 @@
+import os
+import run_suite
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+def case(rel):
+    return os.path.join(ROOT, "spec-testcases", rel)
+
+# -------------------------------------------------------------------
+# In-process runner captures exactly what the subprocess path would see
+# -------------------------------------------------------------------
+
+def test_inprocess_valid_case():
+    out, err, code = run_suite.run_inprocess(case("valid/0008.input"))
+    with open(case("valid/0008.output"), "rb") as f:
+        assert out == f.read()
+    assert err == b""
+    assert code == 0
+
+def test_inprocess_invalid_case_exit_66():
+    out, err, code = run_suite.run_inprocess(case("invalid/0001.input"))
+    assert code == 66
+    assert out == b""
+    assert err.startswith(b"ERROR -- ")
+    assert err.endswith(b"\n")
+
+def test_inprocess_missing_file():
+    out, err, code = run_suite.run_inprocess(case("valid/does-not-exist.input"))
+    assert code == 66
+    assert out == b""
+
+def test_run_one_reports_timing(capsys):
+    assert run_suite.run_one(case("valid/0001.input"), case("valid/0001.output"),
+                             run_suite.run_inprocess)
+    out = capsys.readouterr().out
+    assert out.startswith("OK -- ")
+    assert out.rstrip().endswith(" ms)")
@@ -0,0 +1,113 @@
+import glob
+import hashlib
+import json
+import os
+import pytest
+import spill
+from candidates import TAIL_BYTES
+from spill import SpillCollisionFinder, merge_dirs
+
+EMAIL = b"a@auburn.edu"
+
+def finder(path, width=4, **kw):
+    kw.setdefault("run_records", 512)
+    return SpillCollisionFinder(EMAIL, str(path), last_n=width, processes=1, progress_every=0, **kw)
+
+def stop_after(hashes):
+    return lambda f: sum(f.next_counter.values()) >= hashes
+
+def manifest(path):
+    with open(os.path.join(path, spill.MANIFEST), encoding="utf-8") as fp:
+        return json.load(fp)
+
+def assert_collision(pair, width, algo="sha256"):
+    a, b = pair
+    assert a != b and a.startswith(EMAIL) and b.startswith(EMAIL)
+    assert hashlib.new(algo, a).digest()[-width:] == hashlib.new(algo, b).digest()[-width:]
+
+# -------------------------------------------------------------------
+# Search, checkpoint, resume
+# -------------------------------------------------------------------
+
+def test_finds_a_collision_on_disk(tmp_path):
+    assert_collision(finder(tmp_path, width=2, run_records=64).run(), 2)
+
+def test_interrupted_search_resumes_from_the_manifest(tmp_path):
+    f = finder(tmp_path)
+    f.tick = stop_after(2048)
+    assert f.run() is None
+    m = manifest(tmp_path)
+    assert m["next_counter"]["0"] >= 2048
+    assert sum(r["records"] for r in m["runs"]) == m["hashes"]
+    # Runs are compacted like a binary counter: levels strictly decrease.
+    levels = [r["level"] for r in m["runs"]]
+    assert levels == sorted(set(levels), reverse=True)
+
+    # Leftovers of runs and merges that were in flight when it stopped.
+    (tmp_path / "w000-c9999999999.run").write_bytes(b"\0" * (4 + TAIL_BYTES))
+    (tmp_path / "L09-deadbeef.run.tmp").write_bytes(b"")
+    f = finder(tmp_path, resume=True)
+    on_disk = sorted(os.path.basename(p) for p in glob.glob(str(tmp_path / "*.run*")))
+    assert on_disk == sorted(r["name"] for r in m["runs"])
+    assert f.run_salt.hex() == m["run_salt"]
+    assert f.resumed_at == {0: m["next_counter"]["0"]}
+    assert_collision(f.run(), 4)
+    assert f.total_hashes > m["hashes"]
+
+def test_existing_search_needs_resume(tmp_path):
+    with pytest.raises(ValueError, match="Nothing to resume"):
+        finder(tmp_path, resume=True)
+    f = finder(tmp_path)
+    f.tick = stop_after(1)
+    f.run()
+    with pytest.raises(ValueError, match="--resume"):
+        finder(tmp_path)
+
+@pytest.mark.parametrize("kw", [{"width": 3}, {"algo": "blake2s"}])
+def test_resume_rejects_another_width_or_algo(tmp_path, kw):
+    f = finder(tmp_path)
+    f.tick = stop_after(1)
+    f.run()
+    with pytest.raises(ValueError, match="holds a search"):
+        finder(tmp_path, resume=True, **kw)
+
+# -------------------------------------------------------------------
+# Offline merge
+# -------------------------------------------------------------------
+
+def seed_dir(f, cids):
+    """Write one run with the given candidates into f's spill directory."""
+    records = sorted(f.space.suffix(c) + c.to_bytes(TAIL_BYTES, "big") for c in cids)
+    spill._write_run(os.path.join(f.spill_dir, "w000-c0000000000.run"), records)
+    f.runs = [{"name": "w000-c0000000000.run", "level": 0, "records": len(records)}]
+    f.next_counter = {0: max(cids) + 1}
+    f._save_manifest()
+
+def distinct(f, suffixes, limit):
+    """First `limit` candidate ids whose suffixes are distinct and in `suffixes` (if given)."""
+    cids, seen = [], set()
+    for cid in range(10_000):
+        s = f.space.suffix(cid)
+        if s not in seen and (suffixes is None or s in suffixes):
+            seen.add(s)
+            cids.append(cid)
+            if len(cids) == limit:
+                return cids, seen
+
+def test_merge_dirs_finds_a_collision_across_machines(tmp_path):
+    a = finder(tmp_path / "a", width=1)
+    a_cids, a_suffixes = distinct(a, None, 40)
+    b = finder(tmp_path / "b", width=1)
+    b_cids, _ = distinct(b, a_suffixes, 3)
+    seed_dir(a, a_cids)
+    seed_dir(b, b_cids)
+    # Neither directory holds a collision on its own.
+    assert merge_dirs([str(tmp_path / "a")]) is None
+    pair = merge_dirs([str(tmp_path / "a"), str(tmp_path / "b")])
+    assert_collision(pair, 1)
+
+def test_merge_dirs_rejects_mixed_widths(tmp_path):
+    seed_dir(finder(tmp_path / "a", width=1), [0])
+    seed_dir(finder(tmp_path / "b", width=2), [0])
+    with pytest.raises(ValueError, match="same --bytes"):
+        merge_dirs([str(tmp_path / "a"), str(tmp_path / "b")])
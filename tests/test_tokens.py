@@ -0,0 +1,60 @@
+import pytest
+from Deserializer.deserializer import Deserializer
+from Deserializer.parser import NosjParser
+from Deserializer.tokens import ComplexStrToken, NumToken, SimpleStrToken
+
+def parse_value(raw):
+    return NosjParser(f"(<a:{raw}>)").parse()["a"]
+
+def plain(data):
+    return {k: plain(v) if isinstance(v, dict) else str(v) for k, v in data.items()}
+
+# -------------------------------------------------------------------
+# Scanner classification
+# -------------------------------------------------------------------
+
+@pytest.mark.parametrize("raw, kind", [
+    ("1010", NumToken),
+    ("0", NumToken),
+    ("abcds", SimpleStrToken),
+    ("ef ghs", SimpleStrToken),
+    ("1010s", SimpleStrToken),
+    ("ab%2Ccd", ComplexStrToken),
+    ("s", ComplexStrToken),       # simple strings need a char before the 's'
+    ("abcd", ComplexStrToken),
+    ("", ComplexStrToken),
+    ("102", ComplexStrToken),
+])
+def test_values_are_typed_while_scanning(raw, kind):
+    val = parse_value(raw)
+    assert type(val) is kind
+    assert val == raw
+
+def test_tokens_are_strs():
+    data = NosjParser("(<a:1010,b:(<c:abs>)>)").parse()
+    assert data == {"a": "1010", "b": {"c": "abs"}}
+    assert isinstance(data["b"]["c"], str)
+
+# -------------------------------------------------------------------
+# Typed fast path renders exactly like the regex path
+# -------------------------------------------------------------------
+
+@pytest.mark.parametrize("src", [
+    "(<a:1010,b:abcds,c:ab%2Ccd,d:>)",
+    "(<x:(<y:11110110,z:ef ghs>)>)",
+    "(<a:1010\n>)",               # '$' also matches before a trailing newline
+    "(<a:abs\n>)",
+    "(<a:ab\ts>)",
+])
+def test_typed_render_matches_plain_render(src):
+    data = NosjParser(src).parse()
+    assert Deserializer.render_map(data) == Deserializer.render_map(plain(data))
+
+@pytest.mark.parametrize("src", ["(<a:abcd>)", "(<a:s>)", "(<a:ab%GZ>)", "(<a:a\nb%20>)"])
+def test_typed_errors_match_plain_errors(src):
+    data = NosjParser(src).parse()
+    with pytest.raises(ValueError) as typed:
+        Deserializer.render_map(data)
+    with pytest.raises(ValueError) as untyped:
+        Deserializer.render_map(plain(data))
+    assert str(typed.value) == str(untyped.value)